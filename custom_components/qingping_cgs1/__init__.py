@@ -2,12 +2,12 @@
 from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_MAC, EVENT_CORE_CONFIG_UPDATE, Platform, UnitOfTemperature
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 import logging
 
-from .const import DOMAIN, CONF_TEMPERATURE_OFFSET, CONF_HUMIDITY_OFFSET, DEFAULT_OFFSET, CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
+from .const import DOMAIN, MQTT_TOPIC_PREFIX, CONF_TEMPERATURE_OFFSET, CONF_HUMIDITY_OFFSET, DEFAULT_OFFSET, CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
 
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.NUMBER, Platform.SELECT, Platform.SWITCH, Platform.BUTTON, Platform.TIME]
 
@@ -25,7 +25,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         """
         # Note: This is a placeholder. In a real scenario, you might
         # fetch data from an API or process local data here.
-        return {}
+        # Return the shared entry dict so a refresh never swaps coordinator.data
+        # for an empty dict (entities read topics and settings from it).
+        return hass.data[DOMAIN].get(entry.entry_id, {})
 
     coordinator = DataUpdateCoordinator(
         hass,
@@ -45,10 +47,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         CONF_HUMIDITY_OFFSET: entry.data.get(CONF_HUMIDITY_OFFSET, DEFAULT_OFFSET),
         CONF_UPDATE_INTERVAL: entry.data.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
         "coordinator": coordinator,
+        # MQTT topics for this device, built once
+        "up_topic": f"{MQTT_TOPIC_PREFIX}/{entry.data[CONF_MAC]}/up",
+        "down_topic": f"{MQTT_TOPIC_PREFIX}/{entry.data[CONF_MAC]}/down",
+        # Setting changes waiting for the debounced publish, and its cancel callback
+        "pending_settings": {},
+        "cancel_pending_publish": None,
+        "temp_unit_is_f": hass.config.units.temperature_unit == UnitOfTemperature.FAHRENHEIT,
     }
 
     coordinator.data = hass.data[DOMAIN][entry.entry_id]
 
+    @callback
+    def _async_core_config_updated(event: Event) -> None:
+        """Refresh the cached temperature unit when the unit system changes."""
+        coordinator.data["temp_unit_is_f"] = (
+            hass.config.units.temperature_unit == UnitOfTemperature.FAHRENHEIT
+        )
+
+    entry.async_on_unload(
+        hass.bus.async_listen(EVENT_CORE_CONFIG_UPDATE, _async_core_config_updated)
+    )
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
@@ -56,5 +76,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        cancel_pending_publish = entry_data.get("cancel_pending_publish")
+        if cancel_pending_publish is not None:
+            cancel_pending_publish()
+        entry_data.get("pending_settings", {}).clear()
     return unload_ok
\ No newline at end of file
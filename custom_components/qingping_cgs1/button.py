@@ -14,8 +14,6 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import DOMAIN, MQTT_TOPIC_PREFIX
-
 _LOGGER = logging.getLogger(__name__)
 
 from .const import DOMAIN, TLV_MODELS
@@ -79,7 +77,7 @@ class QingpingTLVCO2CalibrationButton(CoordinatorEntity, ButtonEntity):
         }
         payload = tlv_encode(0x32, packets)
 
-        topic = f"qingping/{self._mac}/down"
+        topic = self.coordinator.data["down_topic"]
         await mqtt.async_publish(self.hass, topic, payload)
 
 class QingpingDeviceManualCalibrationButton(ButtonEntity):
@@ -99,7 +97,8 @@ class QingpingDeviceManualCalibrationButton(ButtonEntity):
         """Handle the button press."""
         try:
             payload = {"type": "29"}
-            topic = f"{MQTT_TOPIC_PREFIX}/{self._mac}/down"
+            # Not a coordinator entity, read the topic from the entry data
+            topic = self.hass.data[DOMAIN][self._config_entry.entry_id]["down_topic"]
             
             _LOGGER.info("Triggering manual calibration for %s", self._mac)
             await mqtt.async_publish(self.hass, topic, json.dumps(payload))
@@ -17,6 +17,10 @@ SENSOR_ETVOC = "tvoc_index"
 SENSOR_TLV_ETVOC = "tvoc"
 SENSOR_NOISE = "noise"
 
+# Device status sensor states
+STATUS_ONLINE = "online"
+STATUS_OFFLINE = "offline"
+
 # Unit of measurement
 PERCENTAGE = "%"
 PPM = "ppm"
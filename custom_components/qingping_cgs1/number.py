@@ -239,7 +239,7 @@ class QingpingTLVReportIntervalNumber(CoordinatorEntity, NumberEntity):
             0x04: int_to_bytes_little_endian(int_value, 2)
         }
         payload = tlv_encode(0x32, packets)
-        topic = f"qingping/{self._mac}/down"
+        topic = self.coordinator.data["down_topic"]
         await mqtt.async_publish(self.hass, topic, payload)
 
     async def async_added_to_hass(self) -> None:
@@ -297,7 +297,7 @@ class QingpingTLVSampleIntervalNumber(CoordinatorEntity, NumberEntity):
             0x05: int_to_bytes_little_endian(int_value, 2)
         }
         payload = tlv_encode(0x32, packets)
-        topic = f"qingping/{self._mac}/down"
+        topic = self.coordinator.data["down_topic"]
         await mqtt.async_publish(self.hass, topic, payload)
 
     async def async_added_to_hass(self) -> None:
@@ -367,7 +367,7 @@ class QingpingTLVOffsetNumber(CoordinatorEntity, NumberEntity):
         }
         payload = tlv_encode(0x32, packets)
 
-        topic = f"qingping/{self._mac}/down"
+        topic = self.coordinator.data["down_topic"]
         await mqtt.async_publish(self.hass, topic, payload)
 
     async def async_added_to_hass(self) -> None:
@@ -425,7 +425,7 @@ class QingpingTLVPowerOffTimeNumber(CoordinatorEntity, NumberEntity):
         }
         payload = tlv_encode(0x32, packets)
 
-        topic = f"qingping/{self._mac}/down"
+        topic = self.coordinator.data["down_topic"]
         await mqtt.async_publish(self.hass, topic, payload)
 
     async def async_added_to_hass(self) -> None:
@@ -485,7 +485,7 @@ class QingpingTLVCO2WorkIntervalNumber(CoordinatorEntity, NumberEntity):
         }
         payload = tlv_encode(0x32, packets)
 
-        topic = f"qingping/{self._mac}/down"
+        topic = self.coordinator.data["down_topic"]
         await mqtt.async_publish(self.hass, topic, payload)
 
     async def async_added_to_hass(self) -> None:
@@ -554,7 +554,7 @@ class QingpingDeviceOffsetNumber(CoordinatorEntity, NumberEntity):
             device_value = int(value * 100)
         else:  # CONF_HUMIDITY_OFFSET
             device_value = int(value * 10)
-        await publish_setting_change(self.hass, self._mac, self._offset_key, device_value)
+        await publish_setting_change(self.hass, self._config_entry, self._offset_key, device_value)
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added to hass."""
@@ -666,7 +666,7 @@ class QingpingDeviceSensorOffsetNumber(CoordinatorEntity, NumberEntity):
             device_value = int(value * 10)    
         else:
             device_value = int(value)
-        await publish_setting_change(self.hass, self._mac, self._offset_key, device_value)
+        await publish_setting_change(self.hass, self._config_entry, self._offset_key, device_value)
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added to hass."""
@@ -720,7 +720,7 @@ class QingpingDeviceTimeNumber(CoordinatorEntity, NumberEntity):
         
         # Publish setting change to device
         from .sensor import publish_setting_change
-        await publish_setting_change(self.hass, self._mac, self._time_key, int(value))
+        await publish_setting_change(self.hass, self._config_entry, self._time_key, int(value))
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added to hass."""
@@ -771,7 +771,7 @@ class QingpingDeviceTimezoneNumber(CoordinatorEntity, NumberEntity):
         # Publish setting change to device (value * 10 for device)
         from .sensor import publish_setting_change
         device_value = int(value * 10)
-        await publish_setting_change(self.hass, self._mac, CONF_TIMEZONE, device_value)
+        await publish_setting_change(self.hass, self._config_entry, CONF_TIMEZONE, device_value)
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added to hass."""
@@ -189,7 +189,7 @@ class QingpingTLVeTVOCUnitSelect(CoordinatorEntity, SelectEntity):
         }
         payload = tlv_encode(0x32, packets)
         
-        topic = f"qingping/{self._mac}/down"
+        topic = self.coordinator.data["down_topic"]
         await mqtt.async_publish(self.hass, topic, payload)
 
     async def async_added_to_hass(self) -> None:
@@ -242,7 +242,7 @@ class QingpingDeviceScreensaverTypeSelect(CoordinatorEntity, SelectEntity):
         
         # Publish setting change to device
         from .sensor import publish_setting_change
-        await publish_setting_change(self.hass, self._mac, CONF_SCREENSAVER_TYPE, int(value))
+        await publish_setting_change(self.hass, self._config_entry, CONF_SCREENSAVER_TYPE, int(value))
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added to hass."""
@@ -359,7 +359,7 @@ class QingpingDeviceTemperatureUnitSelect(CoordinatorEntity, SelectEntity):
         }
         payload = tlv_encode(0x32, packets)
         
-        topic = f"qingping/{self._mac}/down"
+        topic = self.coordinator.data["down_topic"]
         await mqtt.async_publish(self.hass, topic, payload)
 
     async def async_added_to_hass(self) -> None:
@@ -4,8 +4,16 @@ from __future__ import annotations
 import json
 import logging
 from datetime import timedelta
+from functools import lru_cache
+from typing import Any
 import time, math
 import asyncio
+import random
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant core
+    orjson = None
 
 from homeassistant.components import mqtt
 from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
@@ -14,74 +22,178 @@ from homeassistant.const import CONF_NAME, CONF_MAC, CONF_MODEL, UnitOfTemperatu
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity, DataUpdateCoordinator
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import async_track_time_interval, async_call_later
+from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.exceptions import HomeAssistantError
 
 from .const import (
-    DOMAIN, MQTT_TOPIC_PREFIX,
+    DOMAIN,
     SENSOR_BATTERY, SENSOR_CO2, SENSOR_HUMIDITY, SENSOR_PM10, SENSOR_PM25, SENSOR_TEMPERATURE, SENSOR_TVOC, SENSOR_ETVOC,
     SENSOR_NOISE, SENSOR_PRESSURE, SENSOR_LIGHT, SENSOR_SIGNAL_STRENGTH, SENSOR_TLV_ETVOC,
     PERCENTAGE, PPM, PPB, CONCENTRATION, CONF_TVOC_UNIT, CONF_ETVOC_UNIT, DB,
     CONF_TEMPERATURE_OFFSET, CONF_HUMIDITY_OFFSET, CONF_UPDATE_INTERVAL,
+    CONF_CO2_OFFSET, CONF_PM25_OFFSET, CONF_PM10_OFFSET,
+    CONF_NOISE_OFFSET, CONF_TVOC_OFFSET, CONF_TVOC_INDEX_OFFSET,
+    CONF_POWER_OFF_TIME, CONF_DISPLAY_OFF_TIME, CONF_NIGHT_MODE_START_TIME,
+    CONF_NIGHT_MODE_END_TIME, CONF_AUTO_SLIDING_TIME, CONF_SCREENSAVER_TYPE,
+    CONF_CO2_ASC,
     CONF_REPORT_INTERVAL, CONF_SAMPLE_INTERVAL,
     ATTR_TYPE, ATTR_UP_ITVL, ATTR_DURATION,
     DEFAULT_TYPE, DEFAULT_DURATION, TLV_MODELS, JSON_MODELS,
-    CONF_REPORT_MODE, REPORT_MODE_HISTORIC, REPORT_MODE_REALTIME
+    CONF_REPORT_MODE, REPORT_MODE_HISTORIC, REPORT_MODE_REALTIME,
+    STATUS_ONLINE, STATUS_OFFLINE
 )
 from .tlv_decoder import tlv_decode, is_tlv_format
-from .tlv_encoder import tlv_encode, int_to_bytes_little_endian
+from .tlv_encoder import tlv_encode
 
 _LOGGER = logging.getLogger(__name__)
 
 OFFLINE_TIMEOUT_REALTIME = 300  # 5 minutes for real-time mode
 OFFLINE_TIMEOUT_HISTORIC = 900  # 15 minutes for historic mode
 MQTT_PUBLISH_RETRY_LIMIT = 3
-MQTT_PUBLISH_RETRY_DELAY = 5  # seconds
+MQTT_CONNECT_TIMEOUT = 5  # seconds to wait for the broker connection
+MQTT_PUBLISH_RETRY_DELAY = 5  # seconds, base delay doubled on every retry
+MQTT_PUBLISH_RETRY_MAX_DELAY = 30  # seconds
+MQTT_PUBLISH_RETRY_JITTER = 0.5  # seconds
+MAX_REPUBLISH_AGE = 60  # seconds an identical periodic config publish is skipped for while the device is online
 SETTING_CHANGE_DELAY = 5  # seconds delay before publishing setting changes
-
-# Store pending setting publishes to debounce rapid changes
-_pending_setting_publishes = {}
+SIGNAL_AVAILABILITY = "qingping_avail_{}"  # formatted with the device MAC
+
+# MQTT accepts bytes payloads, so orjson output is published without decoding
+_json_dumps = orjson.dumps if orjson is not None else json.dumps
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so handlers catch either
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# PM sensors report 99999 when the PM module is disabled
+_PM_SENSOR_TYPES = frozenset((SENSOR_PM10, SENSOR_PM25))
+
+# Models by capability
+_BATTERY_MODELS = frozenset(("CGS1", "CGS2", "CGDN1", "CGP22C", "CGP22W", "CGP23W"))
+# Battery powered TLV models that switch report mode with the charging state
+_AUTO_SWITCH_MODELS = frozenset(("CGP22C", "CGP23W", "CGP22W"))
+
+# TLV frames start with the b"CG" magic, JSON messages with "{"
+_TLV_FIRST_BYTE = b"C"
+
+# Measurement sensors beyond battery, temperature and humidity:
+# (sensor type, name, unit, device class)
+_CO2_SPEC = (SENSOR_CO2, "CO2", PPM, SensorDeviceClass.CO2)
+_PM_SPECS = (
+    (SENSOR_PM10, "PM10", CONCENTRATION, SensorDeviceClass.PM10),
+    (SENSOR_PM25, "PM25", CONCENTRATION, SensorDeviceClass.PM25),
+)
+_NOISE_SPEC = (SENSOR_NOISE, "Noise", DB, SensorDeviceClass.SOUND_PRESSURE)
+_CGR1_SPECS = (
+    _CO2_SPEC,
+    *_PM_SPECS,
+    (SENSOR_LIGHT, "Light", "lx", SensorDeviceClass.ILLUMINANCE),
+    (SENSOR_TLV_ETVOC, "eTVOC", None, SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS_PARTS),
+    _NOISE_SPEC,
+)
+_SENSOR_SPEC_BY_MODEL = {
+    "CGS1": (
+        _CO2_SPEC,
+        *_PM_SPECS,
+        (SENSOR_TVOC, "TVOC", PPB, SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS_PARTS),
+    ),
+    "CGS2": (
+        _CO2_SPEC,
+        *_PM_SPECS,
+        (SENSOR_ETVOC, "eTVOC", None, SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS_PARTS),
+        _NOISE_SPEC,
+    ),
+    "CGDN1": (_CO2_SPEC, *_PM_SPECS),
+    "CGP22C": (_CO2_SPEC,),
+    "CGP23W": ((SENSOR_PRESSURE, "Pressure", "kPa", SensorDeviceClass.PRESSURE),),
+    "CGP22W": (),
+    "CGR1W": _CGR1_SPECS,
+    "CGR1PW": _CGR1_SPECS,
+}
+
+# TLV real-time duration values (key 0x42) and config (CMD 0x32) payloads switching the report mode
+_TLV_REALTIME_ENABLE = (21600).to_bytes(2, "little")  # Real-time for 6 hours
+_TLV_REALTIME_DISABLE = (0).to_bytes(2, "little")  # Disable real-time
+_TLV_PAYLOAD_REALTIME = tlv_encode(0x32, {0x42: _TLV_REALTIME_ENABLE})
+_TLV_PAYLOAD_HISTORIC = tlv_encode(0x32, {0x42: _TLV_REALTIME_DISABLE})
+
+# Map sensor types to their field in decoded TLV sensor data.
+# SENSOR_TLV_ETVOC shares the "tvoc" key with SENSOR_TVOC.
+_TLV_FIELD_MAP = {
+    SENSOR_TEMPERATURE: "temperature",
+    SENSOR_HUMIDITY: "humidity",
+    SENSOR_CO2: "co2",
+    SENSOR_PM25: "pm25",
+    SENSOR_PM10: "pm10",
+    SENSOR_TLV_ETVOC: "tvoc",
+    SENSOR_NOISE: "noise",
+    SENSOR_LIGHT: "light",
+    SENSOR_PRESSURE: "pressure",
+}
+
+# Map TLV CMD codes to descriptions for logging
+TLV_CMD_NAMES = {
+    0x31: "Unknown/Reserved",
+    0x32: "Configuration",
+    0x34: "Event Reporting",
+    0x35: "Button Press",
+    0x39: "Configuration Query",
+    0x41: "Current Reading",
+    0x42: "Historical Data",
+    0x43: "Regular Data",
+    0x47: "Server Config Push",
+}
 
 async def ensure_mqtt_connected(hass):
     """Ensure MQTT is connected before publishing."""
-    for _ in range(5):  # Try up to 5 times
-        if mqtt.is_connected(hass):
-            return True
-        await asyncio.sleep(1)
-    return False
+    if mqtt.is_connected(hass):
+        return True
+
+    # Wake up as soon as the broker connection comes back instead of polling
+    connected = hass.loop.create_future()
+
+    @callback
+    def _on_connection_status(state: bool) -> None:
+        if state and not connected.done():
+            connected.set_result(True)
+
+    unsubscribe = mqtt.async_subscribe_connection_status(hass, _on_connection_status)
+    try:
+        async with asyncio.timeout(MQTT_CONNECT_TIMEOUT):
+            return await connected
+    except TimeoutError:
+        return False
+    finally:
+        unsubscribe()
 
 async def _auto_switch_report_mode_on_battery_state(hass, config_entry, mac, is_charging, model):
     """Automatically switch report mode based on battery charging state."""
-    if model not in ["CGP22C", "CGP23W", "CGP22W"]:
+    if model not in _AUTO_SWITCH_MODELS:
         return
     
-    from .tlv_encoder import tlv_encode, int_to_bytes_little_endian
-    from .const import CONF_REPORT_MODE, REPORT_MODE_HISTORIC, REPORT_MODE_REALTIME
-    
     # Get coordinator
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
     
     # Determine mode based on charging state
     if is_charging:
         # Real-time mode when charging
-        packets = {
-            0x42: int_to_bytes_little_endian(21600, 2),   # Real-time for 6 hours
-        }
+        payload = _TLV_PAYLOAD_REALTIME
         mode_name = "REAL-TIME (charging)"
         new_mode = REPORT_MODE_REALTIME
     else:
         # Historic mode when on battery
-        packets = {
-            0x42: int_to_bytes_little_endian(0, 2),   # Disable real-time
-        }
+        payload = _TLV_PAYLOAD_HISTORIC
         mode_name = "HISTORIC (on battery)"
         new_mode = REPORT_MODE_HISTORIC
     
-    payload = tlv_encode(0x32, packets)
-    topic = f"qingping/{mac}/down"
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    topic = entry_data["down_topic"]
     
     await mqtt.async_publish(hass, topic, payload)
+    # The device now has a different config than the publisher last sent
+    publisher = entry_data.get("config_publisher")
+    if publisher:
+        publisher.forget_published_config()
     
     # Update coordinator data
     coordinator.data[CONF_REPORT_MODE] = new_mode
@@ -91,113 +203,126 @@ async def _auto_switch_report_mode_on_battery_state(hass, config_entry, mac, is_
     new_data[CONF_REPORT_MODE] = new_mode
     hass.config_entries.async_update_entry(config_entry, data=new_data)
     
-    # Refresh coordinator to update all entities
-    await coordinator.async_request_refresh()
+    # coordinator.data is updated in place, so just notify the listeners
+    coordinator.async_update_listeners()
     
-    _LOGGER.info(f"[{mac}] Auto-switched to {mode_name} based on battery state (timeout: {'5min' if is_charging else '15min'})")
+    _LOGGER.info("[%s] Auto-switched to %s based on battery state (timeout: %s)", mac, mode_name, "5min" if is_charging else "15min")
     
-async def publish_setting_change(hass: HomeAssistant, mac: str, setting_key: str, value: any) -> None:
-    """Publish a single setting change to the device with debounce."""
-    # Cancel any pending publish for this setting
-    publish_key = f"{mac}_{setting_key}"
-    if publish_key in _pending_setting_publishes:
-        _pending_setting_publishes[publish_key].cancel()
+async def publish_setting_change(hass: HomeAssistant, config_entry: ConfigEntry, setting_key: str, value: any) -> None:
+    """Queue a setting change and publish all queued changes together after a debounce."""
+    mac = config_entry.data[CONF_MAC]
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    pending_settings = entry_data["pending_settings"]
+    # Last write wins per setting within the debounce window
+    pending_settings[setting_key] = value
+    # Restart the debounce window
+    cancel = entry_data["cancel_pending_publish"]
+    if cancel is not None:
+        cancel()
     
-    async def _delayed_publish():
-        """Publish after delay."""
+    async def _do_publish(settings):
+        """Publish the queued setting changes."""
         try:
-            await asyncio.sleep(SETTING_CHANGE_DELAY)
-            
             if not await ensure_mqtt_connected(hass):
                 _LOGGER.error("MQTT is not connected, cannot publish setting change")
                 return
             
             payload = {
                 "type": "17",
-                "setting": {
-                    setting_key: value
-                }
+                "setting": settings
             }
             
-            topic = f"{MQTT_TOPIC_PREFIX}/{mac}/down"
-            await mqtt.async_publish(hass, topic, json.dumps(payload))
-            _LOGGER.info("Published setting change to %s: %s = %s", mac, setting_key, value)
+            await mqtt.async_publish(hass, entry_data["down_topic"], _json_dumps(payload))
+            _LOGGER.info("Published setting changes to %s: %s", mac, settings)
             
         except Exception as err:
             _LOGGER.error("Failed to publish setting change: %s", err)
-        finally:
-            # Clean up the pending publish
-            if publish_key in _pending_setting_publishes:
-                del _pending_setting_publishes[publish_key]
+
+    @callback
+    def _publish_cb(_now):
+        """Publish once the debounce delay has passed."""
+        entry_data["cancel_pending_publish"] = None
+        settings = dict(pending_settings)
+        pending_settings.clear()
+        hass.async_create_background_task(
+            _do_publish(settings), name="qingping_setting_publish", eager_start=True
+        )
     
-    # Schedule the delayed publish
-    task = asyncio.create_task(_delayed_publish())
-    _pending_setting_publishes[publish_key] = task
+    # Schedule the delayed publish; a newer change cancels this timer
+    entry_data["cancel_pending_publish"] = async_call_later(hass, SETTING_CHANGE_DELAY, _publish_cb)
+
+def _div10(value):
+    """Convert a device value sent as value * 10."""
+    return round(value / 10, 1)
+
+
+def _div100(value):
+    """Convert a device value sent as value * 100."""
+    return round(value / 100, 1)
+
+
+def _div100_f(value):
+    """Convert a Celsius offset sent as value * 100 to a Fahrenheit offset."""
+    return round((value / 100) * 9/5, 1)
+
+
+# Map device settings to HA entity keys and conversion functions.
+# The temperature offset depends on HA's unit system and is handled separately.
+_SETTING_MAPPINGS = {
+    # Humidity offset: device sends value * 10, we need to divide by 10
+    "humidity_offset": (CONF_HUMIDITY_OFFSET, _div10),
+    # Other offsets: direct integer values
+    "co2_offset": (CONF_CO2_OFFSET, int),
+    "pm25_offset": (CONF_PM25_OFFSET, int),
+    "pm10_offset": (CONF_PM10_OFFSET, int),
+    "noise_offset": (CONF_NOISE_OFFSET, int),
+    "tvoc_zoom": (CONF_TVOC_OFFSET, _div10),
+    "tvoc_index_zoom": (CONF_TVOC_INDEX_OFFSET, _div10),
+    # CGDN1 specific settings
+    "power_off_time": (CONF_POWER_OFF_TIME, int),
+    "display_off_time": (CONF_DISPLAY_OFF_TIME, int),
+    "night_mode_start_time": (CONF_NIGHT_MODE_START_TIME, int),
+    "night_mode_end_time": (CONF_NIGHT_MODE_END_TIME, int),
+    "auto_slideing_time": (CONF_AUTO_SLIDING_TIME, int),
+    "screensaver_type": (CONF_SCREENSAVER_TYPE, int),
+    "co2_asc": (CONF_CO2_ASC, int),
+}
 
 async def _update_settings_from_device(hass: HomeAssistant, config_entry: ConfigEntry, settings: dict, model: str) -> None:
     """Update Home Assistant entities when settings are changed on the device."""
-    _LOGGER.info("Starting _update_settings_from_device with settings: %s", settings)
-    
-    from .const import (
-        CONF_TEMPERATURE_OFFSET, CONF_HUMIDITY_OFFSET,
-        CONF_CO2_OFFSET, CONF_PM25_OFFSET, CONF_PM10_OFFSET,
-        CONF_NOISE_OFFSET, CONF_TVOC_OFFSET, CONF_TVOC_INDEX_OFFSET,
-        CONF_POWER_OFF_TIME, CONF_DISPLAY_OFF_TIME, CONF_NIGHT_MODE_START_TIME,
-        CONF_NIGHT_MODE_END_TIME, CONF_AUTO_SLIDING_TIME, CONF_SCREENSAVER_TYPE,
-        CONF_CO2_ASC
-    )
+    _LOGGER.debug("Starting _update_settings_from_device with settings: %s", settings)
     
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
-    native_temp_unit = hass.config.units.temperature_unit
-    if native_temp_unit == UnitOfTemperature.FAHRENHEIT:
-            unit_based_calc = (CONF_TEMPERATURE_OFFSET, lambda x: round((x / 100) * 9/5, 1))
+    # Temperature offset: device sends value * 100, converted to HA's native unit.
+    # Fall back to the core config if coordinator data lacks the cached flag.
+    temp_unit_is_f = coordinator.data.get("temp_unit_is_f")
+    if temp_unit_is_f is None:
+        temp_unit_is_f = hass.config.units.temperature_unit == UnitOfTemperature.FAHRENHEIT
+    if temp_unit_is_f:
+        temperature_converter = _div100_f
     else:
-            unit_based_calc = (CONF_TEMPERATURE_OFFSET, lambda x: round(x / 100, 1))
-    updated = False
-    
-    # Map device settings to HA entity keys and conversion functions
-    setting_mappings = {
-        # Temperature offset: device sends value * 100, we need to divide by 100
-        "temperature_offset": unit_based_calc,
-        # Humidity offset: device sends value * 10, we need to divide by 10
-        "humidity_offset": (CONF_HUMIDITY_OFFSET, lambda x: round(x / 10, 1)),
-        # Other offsets: direct integer values
-        "co2_offset": (CONF_CO2_OFFSET, int),
-        "pm25_offset": (CONF_PM25_OFFSET, int),
-        "pm10_offset": (CONF_PM10_OFFSET, int),
-        "noise_offset": (CONF_NOISE_OFFSET, int),
-        "tvoc_zoom": (CONF_TVOC_OFFSET, lambda x: round(x / 10, 1)),
-        "tvoc_index_zoom": (CONF_TVOC_INDEX_OFFSET, lambda x: round(x / 10, 1)),
-        # CGDN1 specific settings
-        "power_off_time": (CONF_POWER_OFF_TIME, int),
-        "display_off_time": (CONF_DISPLAY_OFF_TIME, int),
-        "night_mode_start_time": (CONF_NIGHT_MODE_START_TIME, int),
-        "night_mode_end_time": (CONF_NIGHT_MODE_END_TIME, int),
-        "auto_slideing_time": (CONF_AUTO_SLIDING_TIME, int),
-        "screensaver_type": (CONF_SCREENSAVER_TYPE, int),
-        "co2_asc": (CONF_CO2_ASC, int),
-    }
+        temperature_converter = _div100
+    changes: dict[str, Any] = {}
     
     for device_key, value in settings.items():
-        _LOGGER.info("Processing setting: %s = %s", device_key, value)
-        if device_key in setting_mappings:
-            ha_key, converter = setting_mappings[device_key]
+        _LOGGER.debug("Processing setting: %s = %s", device_key, value)
+        if device_key == "temperature_offset":
+            mapping = (CONF_TEMPERATURE_OFFSET, temperature_converter)
+        else:
+            mapping = _SETTING_MAPPINGS.get(device_key)
+        if mapping is not None:
+            ha_key, converter = mapping
             try:
                 converted_value = converter(value)
-                _LOGGER.info("Converted %s: %s -> %s", device_key, value, converted_value)
+                _LOGGER.debug("Converted %s: %s -> %s", device_key, value, converted_value)
                 
                 # Update coordinator data
                 if coordinator.data.get(ha_key) != converted_value:
                     coordinator.data[ha_key] = converted_value
-                    updated = True
-                    _LOGGER.info("Updated %s from device: %s", ha_key, converted_value)
-                    
-                    # Update config entry
-                    new_data = dict(config_entry.data)
-                    new_data[ha_key] = converted_value
-                    hass.config_entries.async_update_entry(config_entry, data=new_data)
+                    changes[ha_key] = converted_value
+                    _LOGGER.debug("Updated %s from device: %s", ha_key, converted_value)
                 else:
-                    _LOGGER.info("Setting %s already has value %s, no update needed", ha_key, converted_value)
+                    _LOGGER.debug("Setting %s already has value %s, no update needed", ha_key, converted_value)
                     
             except (ValueError, TypeError) as err:
                 _LOGGER.error("Failed to convert setting %s with value %s: %s", device_key, value, err)
@@ -205,16 +330,20 @@ async def _update_settings_from_device(hass: HomeAssistant, config_entry: Config
             _LOGGER.debug("Unknown setting key from device: %s", device_key)
     
     # Refresh coordinator to update all entities
-    if updated:
-        _LOGGER.info("Settings updated, refreshing coordinator")
-        await coordinator.async_request_refresh()
+    if changes:
+        # Persist all changed settings with a single config entry update
+        new_data = {**config_entry.data, **changes}
+        hass.config_entries.async_update_entry(config_entry, data=new_data)
+        _LOGGER.info("Settings updated, notifying coordinator listeners")
+        # coordinator.data is already updated in place, so just fan out to the
+        # listeners instead of running a (no-op) refresh
+        coordinator.async_update_listeners()
     else:
-        _LOGGER.info("No settings were updated")
+        _LOGGER.debug("No settings were updated")
 
 
 async def _send_initial_tlv_config(hass, config_entry, mac, model):
     """Send initial default configuration to TLV device on first setup."""
-    from .tlv_encoder import tlv_encode, int_to_bytes_little_endian
     from .const import (
         CONF_REPORT_MODE, REPORT_MODE_REALTIME, CONF_REPORT_INTERVAL, 
         CONF_SAMPLE_INTERVAL, CONF_TEMPERATURE_UNIT
@@ -222,10 +351,10 @@ async def _send_initial_tlv_config(hass, config_entry, mac, model):
     
     # Check if this is first time setup (no report mode set yet)
     if CONF_REPORT_MODE in config_entry.data:
-        _LOGGER.info(f"[{mac}] Device already configured, skipping initial config")
+        _LOGGER.info("[%s] Device already configured, skipping initial config", mac)
         return
     
-    _LOGGER.info(f"[{mac}] Sending initial default configuration to new TLV device")
+    _LOGGER.info("[%s] Sending initial default configuration to new TLV device", mac)
     
     # Get Home Assistant's native temperature unit
     native_temp_unit = hass.config.units.temperature_unit
@@ -246,19 +375,24 @@ async def _send_initial_tlv_config(hass, config_entry, mac, model):
     
     # Send default configuration commands
     packets = {
-        0x42: int_to_bytes_little_endian(21600, 2),  # Real-time for 6 hours
+        0x42: _TLV_REALTIME_ENABLE,  # Real-time for 6 hours
         0x19: bytes([1 if temp_unit == "fahrenheit" else 0])  # Temperature unit
     }
     
     # Add CO2 work interval for CGP22C
     if model == "CGP22C":
-        packets[0x3C] = int_to_bytes_little_endian(10, 2)
+        packets[0x3C] = (10).to_bytes(2, "little")
     
     payload = tlv_encode(0x32, packets)
-    topic = f"qingping/{mac}/down"
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    topic = entry_data["down_topic"]
     
     await mqtt.async_publish(hass, topic, payload)
-    _LOGGER.info(f"[{mac}] Initial config sent: Real-time mode, temp unit: {temp_unit}")
+    # The device now has a different config than the publisher last sent
+    publisher = entry_data.get("config_publisher")
+    if publisher:
+        publisher.forget_published_config()
+    _LOGGER.info("[%s] Initial config sent: Real-time mode, temp unit: %s", mac, temp_unit)
 
 
 async def async_setup_entry(
@@ -272,6 +406,7 @@ async def async_setup_entry(
     model = config_entry.data[CONF_MODEL]
     coordinator = hass.data[DOMAIN][config_entry.entry_id]["coordinator"]
     native_temp_unit = hass.config.units.temperature_unit
+    up_topic = coordinator.data["up_topic"]
     
     # Initialize coordinator data with default values to prevent "None" warnings
     if model == "CGS1" and CONF_TVOC_UNIT not in coordinator.data:
@@ -315,40 +450,21 @@ async def async_setup_entry(
         ]
 
     #sensors.append(QingpingDeviceSensor(coordinator, config_entry, mac, name, SENSOR_BATTERY, "Battery", PERCENTAGE, SensorDeviceClass.BATTERY, SensorStateClass.MEASUREMENT, device_info))
-    if model in ["CGS1", "CGS2", "CGDN1", "CGP22C", "CGP22W", "CGP23W"]:
+    if model in _BATTERY_MODELS:
         sensors.append(battery_state)
-        sensors.append(QingpingDeviceSensor(coordinator, config_entry, mac, name, SENSOR_BATTERY, "Battery", PERCENTAGE, SensorDeviceClass.BATTERY, SensorStateClass.MEASUREMENT, device_info))
-    sensors.append(QingpingDeviceSensor(coordinator, config_entry, mac, name, SENSOR_TEMPERATURE, "Temperature", native_temp_unit, SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT, device_info))
-    sensors.append(QingpingDeviceSensor(coordinator, config_entry, mac, name, SENSOR_HUMIDITY, "Humidity", PERCENTAGE, SensorDeviceClass.HUMIDITY, SensorStateClass.MEASUREMENT, device_info))
-
-    
-    # Add CO2 for models that have it
-    if model in ["CGS1", "CGS2", "CGDN1", "CGP22C", "CGR1W", "CGR1PW"]:
-        sensors.append(QingpingDeviceSensor(coordinator, config_entry, mac, name, SENSOR_CO2, "CO2", PPM, SensorDeviceClass.CO2, SensorStateClass.MEASUREMENT, device_info))
-    
-    # Add PM sensors only for models that have them
-    if model in ["CGS1", "CGS2", "CGDN1", "CGR1W", "CGR1PW"]:
-        sensors.append(QingpingDeviceSensor(coordinator, config_entry, mac, name, SENSOR_PM10, "PM10", CONCENTRATION, SensorDeviceClass.PM10, SensorStateClass.MEASUREMENT, device_info))
-        sensors.append(QingpingDeviceSensor(coordinator, config_entry, mac, name, SENSOR_PM25, "PM25", CONCENTRATION, SensorDeviceClass.PM25, SensorStateClass.MEASUREMENT, device_info))
-        
-
-
-
-    if model == "CGS1":
-        sensors.append(QingpingDeviceSensor(coordinator, config_entry, mac, name, SENSOR_TVOC, "TVOC", PPB, SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS_PARTS, SensorStateClass.MEASUREMENT, device_info))
-    elif model == "CGS2":
-        sensors.append(QingpingDeviceSensor(coordinator, config_entry, mac, name, SENSOR_ETVOC, "eTVOC", None, SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS_PARTS, SensorStateClass.MEASUREMENT, device_info))
-        sensors.append(QingpingDeviceSensor(coordinator, config_entry, mac, name, SENSOR_NOISE, "Noise", DB, SensorDeviceClass.SOUND_PRESSURE, SensorStateClass.MEASUREMENT, device_info))
-    elif model == "CGP23W":  # NEW
-        sensors.append(QingpingDeviceSensor(coordinator, config_entry, mac, name, SENSOR_PRESSURE, "Pressure", "kPa", SensorDeviceClass.PRESSURE, SensorStateClass.MEASUREMENT, device_info))
-    elif model in ["CGR1W", "CGR1PW"]:  # NEW
-        sensors.append(QingpingDeviceSensor(coordinator, config_entry, mac, name, SENSOR_LIGHT, "Light", "lx", SensorDeviceClass.ILLUMINANCE, SensorStateClass.MEASUREMENT, device_info))
-        sensors.append(QingpingDeviceSensor(coordinator, config_entry, mac, name, SENSOR_TLV_ETVOC, "eTVOC", None, SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS_PARTS, SensorStateClass.MEASUREMENT, device_info))
-        sensors.append(QingpingDeviceSensor(coordinator, config_entry, mac, name, SENSOR_NOISE, "Noise", DB, SensorDeviceClass.SOUND_PRESSURE, SensorStateClass.MEASUREMENT, device_info))
+        sensors.append(QingpingDeviceSensor(coordinator, config_entry, mac, name, SENSOR_BATTERY, "Battery", PERCENTAGE, SensorDeviceClass.BATTERY, SensorStateClass.MEASUREMENT, device_info, status_sensor))
+    sensors.append(QingpingDeviceSensor(coordinator, config_entry, mac, name, SENSOR_TEMPERATURE, "Temperature", native_temp_unit, SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT, device_info, status_sensor))
+    sensors.append(QingpingDeviceSensor(coordinator, config_entry, mac, name, SENSOR_HUMIDITY, "Humidity", PERCENTAGE, SensorDeviceClass.HUMIDITY, SensorStateClass.MEASUREMENT, device_info, status_sensor))
+
+    # Add the model specific measurement sensors
+    sensors.extend(
+        QingpingDeviceSensor(coordinator, config_entry, mac, name, sensor_type, cln_name, unit, device_class, SensorStateClass.MEASUREMENT, device_info, status_sensor)
+        for sensor_type, cln_name, unit, device_class in _SENSOR_SPEC_BY_MODEL.get(model, ())
+    )
     
     # Add signal strength for TLV devices
     if model in TLV_MODELS:
-        signal_sensor = QingpingDeviceSensor(coordinator, config_entry, mac, name, SENSOR_SIGNAL_STRENGTH, "Signal Strength", "dBm", SensorDeviceClass.SIGNAL_STRENGTH, SensorStateClass.MEASUREMENT, device_info)
+        signal_sensor = QingpingDeviceSensor(coordinator, config_entry, mac, name, SENSOR_SIGNAL_STRENGTH, "Signal Strength", "dBm", SensorDeviceClass.SIGNAL_STRENGTH, SensorStateClass.MEASUREMENT, device_info, status_sensor)
         signal_sensor._attr_entity_category = EntityCategory.DIAGNOSTIC
         sensors.append(signal_sensor)
 
@@ -358,120 +474,139 @@ async def async_setup_entry(
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN].setdefault(config_entry.entry_id, {})
     hass.data[DOMAIN][config_entry.entry_id]["sensors"] = sensors
+    sensors_by_type = {
+        sensor._sensor_type: sensor for sensor in sensors if isinstance(sensor, QingpingDeviceSensor)
+    }
+    hass.data[DOMAIN][config_entry.entry_id]["sensors_by_type"] = sensors_by_type
+    # Config messages are per device, so any one measurement sensor can send them
+    hass.data[DOMAIN][config_entry.entry_id]["config_publisher"] = next(iter(sensors_by_type.values()), None)
     
     # Send initial configuration for new TLV devices
     if model in TLV_MODELS:
         await _send_initial_tlv_config(hass, config_entry, mac, model)
 
+    # Offset from the event loop's monotonic clock to wall-clock time, so message
+    # timestamps come from a cheap loop.time() read instead of time.time()
+    loop_epoch_offset = time.time() - hass.loop.time()
+
+    # Canonical MAC (no colons, upper case) to compare against incoming messages,
+    # plus the casing/colon variants devices may send, matched without normalizing
+    expected_mac = mac.replace(":", "").upper()
+    colon_mac = ":".join(expected_mac[i:i + 2] for i in range(0, len(expected_mac), 2))
+    expected_mac_variants = frozenset((
+        expected_mac, expected_mac.lower(), colon_mac, colon_mac.lower(),
+    ))
+
     @callback
     def message_received(message):
         """Handle new MQTT messages."""
         try:
-            # Check if TLV binary format
-            if is_tlv_format(message.payload):
+            # Check if TLV binary format. The first-byte compare is only a cheap
+            # hint that skips the call for JSON ('{') payloads; is_tlv_format decides.
+            if message.payload[:1] == _TLV_FIRST_BYTE and is_tlv_format(message.payload):
                 _handle_tlv_message(message)
                 return
-            
+
             # Otherwise handle as JSON
-            payload = json.loads(message.payload)
+            payload = _json_loads(message.payload)
             
             if not isinstance(payload, dict):
                 _LOGGER.error("Payload is not a dictionary")
                 return
 
-            # Check message type first - type 28 (settings) messages don't include MAC
-            message_type = payload.get("type")
-            
             # For messages with MAC, verify it matches
-            received_mac = payload.get("mac", "").replace(":", "").upper()
-            expected_mac = mac.replace(":", "").upper()
-            
             # Skip MAC check for messages without MAC (type 28, 13, 10, 17, etc.)
             # We're subscribed to this device's specific topic, so we know it's for us
-            if received_mac and received_mac != expected_mac:
-                _LOGGER.debug("Received message for a different device. Expected: %s, Got: %s", expected_mac, received_mac)
-                return
+            received_mac = payload.get("mac")
+            if received_mac and received_mac not in expected_mac_variants:
+                # Only normalize forms not covered by the precomputed variants
+                received_mac = received_mac.replace(":", "").upper()
+                if received_mac != expected_mac:
+                    _LOGGER.debug("Received message for a different device. Expected: %s, Got: %s", expected_mac, received_mac)
+                    return
             
+            # Devices send the type as int or numeric string - normalize it once
+            try:
+                message_type = int(payload.get("type"))
+            except (TypeError, ValueError):
+                message_type = None
+
             _LOGGER.debug("Processing MQTT message type %s for device %s", message_type, mac)
             
             # Update timestamp first - any message from device means it's online
             # Always use current system time, not device's timestamp which may be unreliable
-            current_timestamp = int(time.time())
+            # The .hass guards below must stay: async_write_ha_state raises while an
+            # entity is not added yet, and disabled entities (e.g. the report type
+            # sensor by default) never get hass, so no one-time readiness latch works
             if status_sensor.hass:
-                status_sensor.update_timestamp(current_timestamp)
-
-            firmware_version = payload.get("version")
-            if firmware_version is not None:
-                if firmware_sensor.hass:
-                    firmware_sensor.update_version(firmware_version)
-
-            device_type = payload.get("type")
-            if device_type is not None:
-                if type_sensor.hass:
-                    type_sensor.update_type(device_type)
-
-            mac_address = payload.get("mac")
-            if mac_address is not None:
-                if mac_sensor.hass:
-                    mac_sensor.update_mac(mac_address)
+                status_sensor.update_timestamp(int(hass.loop.time() + loop_epoch_offset))
 
-            # Handle type 28 messages (device settings update) - Check BEFORE sensorData
-            if message_type == 28 or message_type == "28":
+            # Handle type 28 messages (device settings update) - these carry no
+            # version/mac/sensorData, so short-circuit before anything else
+            if message_type == 28:
                 _LOGGER.info("Type 28 settings update received for device %s", mac)
                 settings = payload.get("setting", {})
                 if settings:
-                    hass.async_create_task(_update_settings_from_device(hass, config_entry, settings, model))
+                    hass.async_create_task(
+                        _update_settings_from_device(hass, config_entry, settings, model),
+                        eager_start=True,
+                    )
                 else:
                     _LOGGER.warning("Type 28 message has no settings dict")
                 return  # Don't process as sensor data
 
+            if "version" in payload:
+                firmware_version = payload["version"]
+                if firmware_version is not None and firmware_sensor.hass:
+                    firmware_sensor.update_version(firmware_version)
+
+            if message_type is not None and type_sensor.hass:
+                type_sensor.update_type(message_type)
+
+            if "mac" in payload:
+                mac_address = payload["mac"]
+                if mac_address is not None and mac_sensor.hass:
+                    mac_sensor.update_mac(mac_address)
+
+            # Type 17/13 sensor data is ignored; only the status and diagnostics
+            # above are updated from these messages
+            if message_type in (17, 13):
+                _LOGGER.debug("Ignoring type %s sensorData for device %s", message_type, mac)
+                return
+
             sensor_data = payload.get("sensorData")
             if not isinstance(sensor_data, list) or not sensor_data:
                 _LOGGER.debug("No valid sensorData in payload, possibly a config response or device just powered on")
                 # Device is online, just waiting for sensor data
                 return
-            #if len(sensor_data) == 1:
-            if message_type not in [17, 13, "17", "13"]:
-                #ignore type 17 sensor data                
-                for data in sensor_data:
-                    battery_charging = None
-                    battery_status = None
-                    if SENSOR_BATTERY in data:
-                        battery_data = data[SENSOR_BATTERY]
-                        if isinstance(battery_data, dict):
-                            battery_status = battery_data.get("status")
-                            if battery_status is not None:
-                                battery_charging = (battery_status == 1)  # Explicitly True or False
-                    
-                    # Update battery state sensor first if we have status
-                    if battery_status is not None and battery_state.hass:
-                        battery_state.update_battery_state(battery_status)
-                    
-                    for sensor in sensors[5:]:  # Skip status, firmware, mac, type, and battery_state sensors
-                        if not sensor.hass:
-                            continue
-                        if sensor._sensor_type in data:
-                            sensor_data = data[sensor._sensor_type]
-                            if isinstance(sensor_data, dict):
-                                value = sensor_data.get("value")
-                                status = sensor_data.get("status")
-                                # Check if PM sensor is disabled (value=99999)
-                                if sensor._sensor_type in [SENSOR_PM10, SENSOR_PM25] and value == 99999:
-                                    sensor.set_unavailable()
-                                elif value is not None:
-                                    sensor.update_from_latest_data(value)
-                                    if sensor._sensor_type == SENSOR_BATTERY and battery_charging is not None:
-                                        sensor.update_battery_charging(battery_charging)
-                            else:
-                                # Handle non-dict values (backward compatibility)
-                                value = sensor_data
-                                if value is not None:
-                                    sensor.update_from_latest_data(value)
-                                    if sensor._sensor_type == SENSOR_BATTERY and battery_charging is not None:
-                                        sensor.update_battery_charging(battery_charging)
-            else:
-                _LOGGER.info("sensorData is type 17")
-                return
+            for data in sensor_data:
+                battery_charging = None
+                battery_status = None
+                if SENSOR_BATTERY in data:
+                    battery_data = data[SENSOR_BATTERY]
+                    if isinstance(battery_data, dict):
+                        battery_status = battery_data.get("status")
+                        if battery_status is not None:
+                            battery_charging = (battery_status == 1)  # Explicitly True or False
+
+                # Update battery state sensor first if we have status
+                if battery_status is not None and battery_state.hass:
+                    battery_state.update_battery_state(battery_status)
+
+                for sensor_type, field_data in data.items():
+                    sensor = sensors_by_type.get(sensor_type)
+                    if sensor is None or not sensor.hass:
+                        continue
+                    # Fields are {"value": ..., "status": ...}; bare values are
+                    # still accepted for backward compatibility
+                    value = field_data.get("value") if isinstance(field_data, dict) else field_data
+                    # Check if PM sensor is disabled (value=99999)
+                    if value == 99999 and sensor_type in _PM_SENSOR_TYPES:
+                        sensor.set_unavailable()
+                    elif value is not None:
+                        sensor.update_from_latest_data(value)
+                        if sensor_type == SENSOR_BATTERY and battery_charging is not None:
+                            sensor.update_battery_charging(battery_charging)
 
         except json.JSONDecodeError:
             _LOGGER.error("Invalid JSON in MQTT message: %s", message.payload)
@@ -482,29 +617,16 @@ async def async_setup_entry(
         """Handle TLV binary format messages."""
         try:
             cmd = message.payload[2] if len(message.payload) > 2 else 0
-            # Map CMD codes to descriptions for logging
-            cmd_names = {
-                0x31: "Unknown/Reserved",
-                0x32: "Configuration",
-                0x34: "Event Reporting",
-                0x35: "Button Press",
-                0x39: "Configuration Query",
-                0x41: "Current Reading",
-                0x42: "Historical Data",
-                0x43: "Regular Data",
-                0x47: "Server Config Push",
-            }
-            cmd_name = cmd_names.get(cmd, "Unknown")
-            _LOGGER.debug(f"[TLV] Received CMD: 0x{cmd:02x} ({cmd_name})")
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug("[TLV] Received CMD: 0x%02x (%s)", cmd, TLV_CMD_NAMES.get(cmd, "Unknown"))
 
             decoded = tlv_decode(message.payload)
             if not decoded:
                 return
             
             # Update status
-            current_timestamp = int(time.time())
             if status_sensor.hass:
-                status_sensor.update_timestamp(current_timestamp)
+                status_sensor.update_timestamp(int(hass.loop.time() + loop_epoch_offset))
             
             # Update firmware
             if "version" in decoded and firmware_sensor.hass:
@@ -523,11 +645,13 @@ async def async_setup_entry(
                 
                 # Auto-switch report mode if charging state changed
                 if new_charging_state != old_charging_state:
-                    _LOGGER.info(f"[{mac}] Battery charging state changed: {old_charging_state} -> {new_charging_state}")
-                    asyncio.create_task(
+                    _LOGGER.info("[%s] Battery charging state changed: %s -> %s", mac, old_charging_state, new_charging_state)
+                    hass.async_create_background_task(
                         _auto_switch_report_mode_on_battery_state(
                             hass, config_entry, mac, new_charging_state, model
-                        )
+                        ),
+                        name="qingping_report_mode_switch",
+                        eager_start=True,
                     )
             
             # Process sensor data
@@ -547,57 +671,36 @@ async def async_setup_entry(
                     values = [item[field] for item in sensor_data if isinstance(item, dict) and field in item and isinstance(item[field], (int, float))]
                     if values:
                         data[field] = sum(values) / len(values)
-                _LOGGER.debug(f"[TLV] CMD 0x42: Averaged {len(sensor_data)} historical data entries")
+                _LOGGER.debug("[TLV] CMD 0x42: Averaged %d historical data entries", len(sensor_data))
             else:
                 # For current/real-time data, use first entry
                 data = sensor_data[0] if isinstance(sensor_data, list) else sensor_data
-            if model in ["CGR1W", "CGR1PW"]:
-                all_sensors = sensors[3:]
-            else:
-                all_sensors = sensors[4:]
             # Update sensors
-            for sensor in all_sensors:
-                if not sensor.hass:
-                    continue
-                
-                value = None
-                if sensor._sensor_type == SENSOR_TEMPERATURE and "temperature" in data:
-                    value = data["temperature"]
-                elif sensor._sensor_type == SENSOR_HUMIDITY and "humidity" in data:
-                    value = data["humidity"]
-                elif sensor._sensor_type == SENSOR_CO2 and "co2" in data:
-                    value = data["co2"]
-                elif sensor._sensor_type == SENSOR_PM25 and "pm25" in data:
-                    value = data["pm25"]
-                elif sensor._sensor_type == SENSOR_PM10 and "pm10" in data:
-                    value = data["pm10"]
-                elif sensor._sensor_type == SENSOR_TVOC and "tvoc" in data:
-                    value = data["tvoc"]
-                elif sensor._sensor_type == SENSOR_TLV_ETVOC and "tvoc" in data:
-                    value = data["tvoc"]
-                elif sensor._sensor_type == SENSOR_NOISE and "noise" in data:
-                    value = data["noise"]
-                elif sensor._sensor_type == SENSOR_LIGHT and "light" in data:
-                    value = data["light"]
-                elif sensor._sensor_type == SENSOR_PRESSURE and "pressure" in data:
-                    value = data["pressure"]
-                elif sensor._sensor_type == SENSOR_BATTERY:
-                    # Battery can be in decoded (top level) or data (sensorData)
-                    if "battery" in decoded:
-                        value = decoded["battery"]
-                    elif "battery" in data:
-                        value = data["battery"]
-                    if decoded.get("batteryCharging") or data.get("batteryCharging"):
-                        sensor.update_battery_charging(True)
-                elif sensor._sensor_type == SENSOR_SIGNAL_STRENGTH:
-                    # Signal can be signalStrength (top) or rssi (sensorData)
-                    if "signalStrength" in decoded:
-                        value = decoded["signalStrength"]
-                        if value >= 128:
-                            value -= 256
-                    elif "rssi" in data:
-                        value = data["rssi"]
-                
+            for sensor_type, field in _TLV_FIELD_MAP.items():
+                value = data.get(field)
+                if value is not None:
+                    sensor = sensors_by_type.get(sensor_type)
+                    if sensor is not None and sensor.hass:
+                        sensor.update_from_latest_data(value)
+
+            # Battery can be in decoded (top level) or data (sensorData)
+            sensor = sensors_by_type.get(SENSOR_BATTERY)
+            if sensor is not None and sensor.hass:
+                value = decoded.get("battery", data.get("battery"))
+                if decoded.get("batteryCharging") or data.get("batteryCharging"):
+                    sensor.update_battery_charging(True)
+                if value is not None:
+                    sensor.update_from_latest_data(value)
+
+            # Signal can be signalStrength (top) or rssi (sensorData)
+            sensor = sensors_by_type.get(SENSOR_SIGNAL_STRENGTH)
+            if sensor is not None and sensor.hass:
+                value = decoded.get("signalStrength")
+                if value is not None:
+                    if value >= 128:
+                        value -= 256
+                else:
+                    value = data.get("rssi")
                 if value is not None:
                     sensor.update_from_latest_data(value)
         
@@ -605,24 +708,25 @@ async def async_setup_entry(
             _LOGGER.error("Error processing TLV message: %s", str(e))
 
     await mqtt.async_subscribe(
-        hass, f"{MQTT_TOPIC_PREFIX}/{mac}/up", message_received, 1, encoding=None
+        hass, up_topic, message_received, 1, encoding=None
     )
-    _LOGGER.info("Subscribed to MQTT topic: %s/%s/up", MQTT_TOPIC_PREFIX, mac)
+    _LOGGER.info("Subscribed to MQTT topic: %s", up_topic)
 
     # Set up timer for periodic publishing
     async def publish_config_wrapper(*args):
         if await ensure_mqtt_connected(hass):
-            # Find first sensor with publish_config method
-            for sensor in sensors:
-                if isinstance(sensor, QingpingDeviceSensor) and hasattr(sensor, 'publish_config'):
-                    await sensor.publish_config()
-                    break
+            publisher = hass.data[DOMAIN][config_entry.entry_id].get("config_publisher")
+            if publisher:
+                await publisher.publish_config(connection_checked=True, skip_if_unchanged=True)
         else:
             _LOGGER.error("Failed to connect to MQTT for periodic config publish")
 
-    hass.data[DOMAIN][config_entry.entry_id]["remove_timer"] = async_track_time_interval(
+    remove_timer = async_track_time_interval(
         hass, publish_config_wrapper, timedelta(seconds=int(DEFAULT_DURATION))
     )
+    for sensor in sensors:
+        if isinstance(sensor, QingpingDeviceSensor):
+            sensor._remove_timer = remove_timer
 
     # Publish config immediately upon setup with a delay to ensure entities are ready
     async def delayed_publish():
@@ -632,7 +736,9 @@ async def async_setup_entry(
         else:
             _LOGGER.error("Failed to connect to MQTT for initial config publish")
     
-    asyncio.create_task(delayed_publish())
+    config_entry.async_create_background_task(
+        hass, delayed_publish(), "qingping_initial_config", eager_start=True
+    )
 
 class QingpingDeviceStatusSensor(CoordinatorEntity, SensorEntity):
     """Representation of a Qingping Device status sensor."""
@@ -646,62 +752,129 @@ class QingpingDeviceStatusSensor(CoordinatorEntity, SensorEntity):
         self._attr_unique_id = f"{mac}_status"
         self._attr_device_info = device_info
         self._attr_entity_category = EntityCategory.DIAGNOSTIC
-        self._attr_native_value = "offline"
+        self._attr_native_value = STATUS_OFFLINE
         self._last_timestamp = 0
-        self._last_status = "online"
+        self._last_seen = None  # time.monotonic() of the last message
+        self._last_status = STATUS_ONLINE
+        self._offline_timer = None
+        self._offline_timeout = None  # timeout the offline check was armed with
+        # The model of a config entry never changes
+        self._is_tlv = config_entry.data.get(CONF_MODEL, "CGS1") in TLV_MODELS
 
     @callback
     def update_timestamp(self, timestamp):
         """Update the last received timestamp."""
+        now = time.monotonic()
+        timeout = self._get_offline_timeout()
+        # Push back the offline check, it fires only if the device goes quiet
+        self._offline_timeout = timeout
+        self._schedule_offline_check(timeout)
+        # Fast path: already online and still well within the timeout
+        if (
+            self._attr_native_value == STATUS_ONLINE
+            and self._last_seen is not None
+            and now - self._last_seen < timeout
+        ):
+            self._last_timestamp = int(timestamp)
+            self._last_seen = now
+            return
+
         old_timestamp = self._last_timestamp
         self._last_timestamp = int(timestamp)
+        self._last_seen = now
         old_status = self._attr_native_value
-        if old_timestamp == 0 or old_status == "offline":
+        if old_timestamp == 0 or old_status == STATUS_OFFLINE:
             _LOGGER.info("Device %s came online (timestamp: %s)", self._mac, timestamp)
-        self._update_status()
+        self._update_status(now)
         # Log if status changed unexpectedly
-        if old_status == "online" and self._attr_native_value == "offline":
-            _LOGGER.error("Device %s immediately went offline after timestamp update! old_ts=%s, new_ts=%s, current_time=%s", 
-                         self._mac, old_timestamp, self._last_timestamp, int(time.time()))
+        if old_status == STATUS_ONLINE and self._attr_native_value == STATUS_OFFLINE:
+            _LOGGER.error("Device %s immediately went offline after timestamp update! old_ts=%s, new_ts=%s", 
+                         self._mac, old_timestamp, self._last_timestamp)
+
+    @callback
+    def _schedule_offline_check(self, delay):
+        """(Re)schedule the offline check to run after delay seconds."""
+        self._cancel_offline_timer()
+        self._offline_timer = async_call_later(self.hass, delay, self._mark_offline)
+
+    @callback
+    def _cancel_offline_timer(self):
+        """Cancel the pending offline check, if any."""
+        if self._offline_timer:
+            self._offline_timer()
+            self._offline_timer = None
+
+    @callback
+    def _mark_offline(self, _now):
+        """Mark the device offline when no message arrived within the timeout."""
+        self._offline_timer = None
+        self._update_status()
+        if self._attr_native_value == STATUS_ONLINE:
+            # Timeout grew since the check was armed, check again when it runs out
+            self._offline_timeout = self._get_offline_timeout()
+            remaining = self._offline_timeout - (time.monotonic() - self._last_seen)
+            self._schedule_offline_check(max(remaining, 0))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        # A report mode change alters the timeout, re-arm the offline check for it
+        if self._last_seen is not None:
+            timeout = self._get_offline_timeout()
+            if timeout != self._offline_timeout:
+                self._offline_timeout = timeout
+                remaining = timeout - (time.monotonic() - self._last_seen)
+                self._schedule_offline_check(max(remaining, 0))
+        super()._handle_coordinator_update()
+
+    def _get_offline_timeout(self):
+        """Return the offline timeout in seconds for this device."""
+        # Determine timeout based on device type and report mode
+        if self._is_tlv:
+            report_mode = self.coordinator.data.get(CONF_REPORT_MODE, REPORT_MODE_HISTORIC)
+            return OFFLINE_TIMEOUT_REALTIME if report_mode == REPORT_MODE_REALTIME else OFFLINE_TIMEOUT_HISTORIC
+        # JSON devices use standard timeout
+        return OFFLINE_TIMEOUT_REALTIME
 
     @callback
-    def _update_status(self):
-        """Update the status based on the last timestamp."""
+    def _update_status(self, now=None):
+        """Update the status based on the last timestamp.
+
+        now is a time.monotonic() reading the caller already took, if any.
+        """
         if not self.hass:
             return
         
-        # Get model and report mode to determine timeout
-        model = self._config_entry.data.get(CONF_MODEL, "CGS1")
+        timeout = self._get_offline_timeout()
         
-        # Determine timeout based on device type and mode
-        if model in TLV_MODELS:
-            report_mode = self.coordinator.data.get(CONF_REPORT_MODE, REPORT_MODE_HISTORIC)
-            timeout = OFFLINE_TIMEOUT_REALTIME if report_mode == REPORT_MODE_REALTIME else OFFLINE_TIMEOUT_HISTORIC
+        if self._last_seen is None:
+            time_since_last_msg = math.inf
         else:
-            # JSON devices use standard timeout
-            timeout = OFFLINE_TIMEOUT_REALTIME
-        
-        current_time = int(time.time())
-        time_since_last_msg = current_time - self._last_timestamp
-        new_status = "online" if time_since_last_msg <= timeout else "offline"
+            if now is None:
+                now = time.monotonic()
+            time_since_last_msg = now - self._last_seen
+        # Same boundary as the offline timer: offline once the full timeout has passed
+        new_status = STATUS_ONLINE if time_since_last_msg < timeout else STATUS_OFFLINE
         
         if self._attr_native_value != new_status:
             old_status = self._attr_native_value
             self._attr_native_value = new_status
             self.async_write_ha_state()
-            _LOGGER.info("Device %s status changed from %s to %s (time since last message: %s seconds, timeout: %s)", 
+            _LOGGER.info("Device %s status changed from %s to %s (time since last message: %.0f seconds, timeout: %s)", 
                         self._mac, old_status, new_status, time_since_last_msg, timeout)
             
             # Update other sensors' availability
-            sensors = self.hass.data[DOMAIN][self._config_entry.entry_id].get("sensors", [])
-            for sensor in sensors:
-                if isinstance(sensor, QingpingDeviceSensor) and sensor.hass:
-                    sensor.async_write_ha_state()
+            async_dispatcher_send(self.hass, SIGNAL_AVAILABILITY.format(self._mac))
             
             # Call publish_config when status changes from offline to online
-            if self._last_status == "offline" and new_status == "online":
+            if self._last_status == STATUS_OFFLINE and new_status == STATUS_ONLINE:
                 _LOGGER.info("Device %s recovered from offline, publishing config", self._mac)
-                asyncio.create_task(self._publish_config_on_status_change())
+                self._config_entry.async_create_background_task(
+                    self.hass,
+                    self._publish_config_on_status_change(),
+                    "qingping_status_config",
+                    eager_start=True,
+                )
             
             self._last_status = new_status
 
@@ -711,25 +884,19 @@ class QingpingDeviceStatusSensor(CoordinatorEntity, SensorEntity):
             return
         # Add a small delay to let the device fully come online
         await asyncio.sleep(2)
-        sensors = self.hass.data[DOMAIN][self._config_entry.entry_id].get("sensors", [])
-        for sensor in sensors:
-            if isinstance(sensor, QingpingDeviceSensor):
-                await sensor.publish_config()
-                break  # We only need to call it once                
+        publisher = self.hass.data[DOMAIN][self._config_entry.entry_id].get("config_publisher")
+        if publisher:
+            await publisher.publish_config()
 
     async def async_added_to_hass(self):
-        """Set up a timer to regularly update the status."""
+        """Set up status tracking."""
         await super().async_added_to_hass()
 
         # Immediately check if we should be online based on recent activity
         self._update_status()
 
-        async def update_status(*_):
-            self._update_status()
-
-        self.async_on_remove(async_track_time_interval(
-            self.hass, update_status, timedelta(seconds=60)
-        ))
+        # The offline check is (re)scheduled by update_timestamp
+        self.async_on_remove(self._cancel_offline_timer)
 
 class QingpingDeviceFirmwareSensor(CoordinatorEntity, SensorEntity):
     """Representation of a Qingping Device firmware sensor."""
@@ -748,6 +915,8 @@ class QingpingDeviceFirmwareSensor(CoordinatorEntity, SensorEntity):
     @callback
     def update_version(self, version):
         """Update the firmware version."""
+        if self._attr_native_value == version:
+            return
         self._attr_native_value = version
         self.async_write_ha_state()
 
@@ -768,6 +937,8 @@ class QingpingDeviceMACSensor(CoordinatorEntity, SensorEntity):
     @callback
     def update_mac(self, mac):
         """Update the mac address."""
+        if self._attr_native_value == mac:
+            return
         self._attr_native_value = mac
         self.async_write_ha_state()
 
@@ -791,13 +962,16 @@ class QingpingDeviceBatteryStateSensor(CoordinatorEntity, SensorEntity):
         self._previous_charging_state = (self._attr_native_value == "Charging")
         
         if status == 1:
-            self._attr_native_value = "Charging"
+            battery_state = "Charging"
         elif status == 2:
-            self._attr_native_value = "Fully Charged"
+            battery_state = "Fully Charged"
         elif status == 0:
-            self._attr_native_value = "Discharging"
+            battery_state = "Discharging"
         else:
-            self._attr_native_value = "Unknown"
+            battery_state = "Unknown"
+        if battery_state == self._attr_native_value:
+            return
+        self._attr_native_value = battery_state
         self.async_write_ha_state()
 
 class QingpingDeviceTypeSensor(CoordinatorEntity, SensorEntity):
@@ -819,10 +993,29 @@ class QingpingDeviceTypeSensor(CoordinatorEntity, SensorEntity):
     @callback
     def update_type(self, device_type):
         """Update the device type."""
+        if self._attr_native_value == device_type:
+            return
         self._attr_native_value = device_type
         self.async_write_ha_state()
 
 
+@lru_cache(maxsize=16)
+def _json_config_payload(update_interval: int) -> bytes | str:
+    """Return the serialized JSON config message for an update interval."""
+    return _json_dumps({
+        ATTR_TYPE: DEFAULT_TYPE,
+        ATTR_UP_ITVL: f"{update_interval}",
+        ATTR_DURATION: DEFAULT_DURATION
+    })
+
+
+# Battery icons by level: <=10, <=20, ..., <=90, above 90
+_BATTERY_ICONS = (
+    "mdi:battery-10", "mdi:battery-20", "mdi:battery-30", "mdi:battery-40", "mdi:battery-50",
+    "mdi:battery-60", "mdi:battery-70", "mdi:battery-80", "mdi:battery-90", "mdi:battery",
+)
+
+
 def _get_voc_device_class(unit: str) -> SensorDeviceClass:
     """Get appropriate device class for VOC sensor based on unit."""
     if unit == "index":
@@ -835,10 +1028,83 @@ def _get_voc_device_class(unit: str) -> SensorDeviceClass:
         return SensorDeviceClass.VOLATILE_ORGANIC_COMPOUNDS_PARTS  # default
 
 
+def _update_temperature(sensor, value):
+    """Set a temperature reading, converted to the sensor's unit."""
+    sensor._attr_native_value = round(float(value) * sensor._temp_scale + sensor._temp_offset, 1)
+
+
+def _update_humidity(sensor, value):
+    """Set a humidity reading."""
+    sensor._attr_native_value = round(float(value), 1)
+
+
+def _update_pressure(sensor, value):
+    """Set a pressure reading."""
+    sensor._attr_native_value = round(float(value), 2)
+
+
+def _update_tvoc(sensor, value):
+    """Set a CGS1 TVOC reading (ppb/ppm/mg/m³)."""
+    tvoc_unit = sensor._unit_mode
+    tvoc_value = int(value)
+    if tvoc_unit == "ppm":
+        tvoc_value /= 1000
+    elif tvoc_unit == "mg/m³":
+        tvoc_value /= 218.77
+    sensor._attr_native_value = round(tvoc_value, 3)
+    sensor._attr_native_unit_of_measurement = tvoc_unit
+    sensor._attr_device_class = _get_voc_device_class(tvoc_unit)
+
+
+# The VOC index is an integer in 0-500, so the conversions are memoized
+@lru_cache(maxsize=512)
+def _voc_index_to_ppb(index: int) -> int:
+    """Convert a VOC index to ppb (this is an approximate conversion)."""
+    ppb = (math.log(501 - index) - 6.24) * -2215.4
+    return int(round(float(ppb), 0))
+
+
+@lru_cache(maxsize=512)
+def _voc_index_to_mgm3(index: int) -> float:
+    """Convert a VOC index to mg/m³ (this is an approximate conversion)."""
+    ppb = (math.log(501 - index) - 6.24) * -2215.4
+    return round((ppb * 4.5 * 10 + 5) / 10 / 1000, 3)
+
+
+def _update_etvoc(sensor, value):
+    """Set an eTVOC reading (VOC index, optionally converted to ppb/mg/m³)."""
+    etvoc_unit = sensor._unit_mode
+    etvoc_value = int(value)
+    if etvoc_unit == "ppb":
+        etvoc_value = _voc_index_to_ppb(etvoc_value)
+    elif etvoc_unit == "mg/m³":
+        etvoc_value = _voc_index_to_mgm3(etvoc_value)
+    sensor._attr_native_value = etvoc_value
+    # Set unit to None if "index" is selected (no unit), otherwise use the unit
+    sensor._attr_native_unit_of_measurement = None if etvoc_unit == "index" else etvoc_unit
+    sensor._attr_device_class = _get_voc_device_class(etvoc_unit)
+
+
+def _update_int(sensor, value):
+    """Set an integer reading."""
+    sensor._attr_native_value = int(value)
+
+
+# Value handlers by sensor type. SENSOR_TVOC is shared with SENSOR_TLV_ETVOC and
+# maps to the eTVOC handler; CGS1 TVOC sensors get _update_tvoc instead.
+_VALUE_UPDATERS = {
+    SENSOR_TEMPERATURE: _update_temperature,
+    SENSOR_HUMIDITY: _update_humidity,
+    SENSOR_PRESSURE: _update_pressure,
+    SENSOR_TLV_ETVOC: _update_etvoc,
+    SENSOR_ETVOC: _update_etvoc,
+}
+
+
 class QingpingDeviceSensor(CoordinatorEntity, SensorEntity):
     """Representation of a Qingping Device sensor."""
 
-    def __init__(self, coordinator, config_entry, mac, name, sensor_type, cln_name, unit, device_class, state_class, device_info):
+    def __init__(self, coordinator, config_entry, mac, name, sensor_type, cln_name, unit, device_class, state_class, device_info, status_sensor=None):
         """Initialize the sensor."""
         super().__init__(coordinator)
         self._config_entry = config_entry
@@ -852,84 +1118,57 @@ class QingpingDeviceSensor(CoordinatorEntity, SensorEntity):
         self._attr_device_info = device_info
         self._battery_charging = False
         self._is_unavailable = False
+        self._is_pm_sensor = sensor_type in _PM_SENSOR_TYPES
+        # The model of a config entry never changes
+        self._model = config_entry.data.get(CONF_MODEL, "CGS1")
+        self._is_tlv = self._model in TLV_MODELS
+        self._down_topic = coordinator.data["down_topic"]
+        self._unit_mode = None
+        self._refresh_unit_mode()
+        # The sensor type never changes, so pick the value handler once
+        if sensor_type == SENSOR_TVOC and self._model == "CGS1":
+            self._update_value = _update_tvoc
+        else:
+            self._update_value = _VALUE_UPDATERS.get(sensor_type, _update_int)
+        # Celsius readings are converted with value * scale + offset
+        if unit == UnitOfTemperature.FAHRENHEIT:
+            self._temp_scale, self._temp_offset = 1.8, 32.0
+        else:
+            self._temp_scale, self._temp_offset = 1.0, 0.0
+        self._remove_timer = None
+        # The device's status sensor decides availability
+        self._status_sensor = status_sensor
+        # Last config payload published and its time.monotonic()
+        self._last_published_payload = None
+        self._last_published_ts = 0.0
+
+    @callback
+    def _refresh_unit_mode(self):
+        """Cache the configured VOC unit, it only changes on coordinator updates."""
+        if self._sensor_type == SENSOR_TVOC and self._model == "CGS1":
+            self._unit_mode = self.coordinator.data.get(CONF_TVOC_UNIT, "ppb") or "ppb"
+        elif self._sensor_type in (SENSOR_TVOC, SENSOR_ETVOC):
+            self._unit_mode = self.coordinator.data.get(CONF_ETVOC_UNIT, "index")
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self._refresh_unit_mode()
+        super()._handle_coordinator_update()
 
     @callback
     def update_from_latest_data(self, value):
         """Update the sensor with the latest data."""
+        was_unavailable = self._is_unavailable
+        previous_state = (self._attr_native_value, self._attr_native_unit_of_measurement, self._attr_device_class)
         try:
-            if self._sensor_type == SENSOR_TEMPERATURE:
-                temp_celsius = float(value)
-                if self._attr_native_unit_of_measurement == UnitOfTemperature.FAHRENHEIT:
-                    # Convert to Fahrenheit
-                    temp_fahrenheit = (temp_celsius * 9/5) + 32
-                    self._attr_native_value = round(float(temp_fahrenheit), 1)
-                else:
-                    self._attr_native_value = round(float(temp_celsius), 1)
-            elif self._sensor_type == SENSOR_HUMIDITY:
-                self._attr_native_value = round(float(value), 1)
-            elif self._sensor_type == SENSOR_PRESSURE:
-                self._attr_native_value = round(float(value), 2)
-            elif self._sensor_type == SENSOR_TLV_ETVOC or self._sensor_type == SENSOR_TVOC:
-                model = self._config_entry.data.get(CONF_MODEL)    
-                if model == "CGS1":
-                    # CGS1 JSON device - uses TVOC with ppb/ppm/mg/m³
-                    tvoc_unit = self.coordinator.data.get(CONF_TVOC_UNIT, "ppb")
-                    if tvoc_unit and tvoc_unit != self._attr_native_unit_of_measurement:
-                        old_unit = self._attr_native_unit_of_measurement
-                        current_value = self._attr_native_value 
-                    if tvoc_unit is None or tvoc_unit == "":
-                        tvoc_unit = "ppb"
-                    tvoc_value = int(value)
-                    if tvoc_unit == "ppm":
-                        tvoc_value /= 1000
-                    elif tvoc_unit == "mg/m³":
-                        tvoc_value /= 218.77
-                    self._attr_native_value = round(tvoc_value, 3)
-                    self._attr_native_unit_of_measurement = tvoc_unit
-                    self._attr_device_class = _get_voc_device_class(tvoc_unit)
-                else:
-                    # TLV devices ("CGR1W", "CGR1PW") - uses eTVOC with index/ppb/mg/m³
-                    etvoc_unit = self.coordinator.data.get(CONF_ETVOC_UNIT, "index")
-                    if etvoc_unit and etvoc_unit != self._attr_native_unit_of_measurement:
-                        old_unit = self._attr_native_unit_of_measurement
-                        current_value = self._attr_native_value                         
-                    etvoc_value = int(value)
-                    if etvoc_unit == "ppb":
-                        # Convert VOC index to ppb
-                        etvoc_value = (math.log(501-etvoc_value) - 6.24) * -2215.4
-                        etvoc_value = int(round(float(etvoc_value), 0))
-                    elif etvoc_unit == "mg/m³":
-                        # Convert VOC index to mg/m³
-                        etvoc_value = (math.log(501-etvoc_value) - 6.24) * -2215.4
-                        etvoc_value = (etvoc_value*4.5*10 + 5) / 10 / 1000
-                        etvoc_value = round(etvoc_value, 3)
-                    self._attr_native_value = etvoc_value
-                    # Set unit to None if "index" is selected (no unit), otherwise use the unit
-                    self._attr_native_unit_of_measurement = None if etvoc_unit == "index" else etvoc_unit
-                    self._attr_device_class = _get_voc_device_class(etvoc_unit)
-            elif self._sensor_type == SENSOR_ETVOC:
-                etvoc_unit = self.coordinator.data.get(CONF_ETVOC_UNIT, "index")
-                if etvoc_unit and etvoc_unit != self._attr_native_unit_of_measurement:
-                    old_unit = self._attr_native_unit_of_measurement
-                    current_value = self._attr_native_value
-                etvoc_value = int(value)
-                if etvoc_unit == "ppb":
-                    # Convert VOC index to ppb (this is an approximate conversion)
-                    #etvoc_value = (etvoc_value * 5) + 35
-                    etvoc_value = (math.log(501-etvoc_value) - 6.24) * -2215.4
-                    etvoc_value = int(round(float(etvoc_value), 0))
-                elif etvoc_unit == "mg/m³":
-                    # Convert VOC index to mg/m³ (this is an approximate conversion)
-                    etvoc_value = (math.log(501-etvoc_value) - 6.24) * -2215.4
-                    etvoc_value = (etvoc_value*4.5*10 + 5) / 10 / 1000
-                    etvoc_value = round(etvoc_value, 3)
-                self._attr_native_value = etvoc_value
-                # Set unit to None if "index" is selected (no unit), otherwise use the unit
-                self._attr_native_unit_of_measurement = None if etvoc_unit == "index" else etvoc_unit
-                self._attr_device_class = _get_voc_device_class(etvoc_unit)
-            else:
-                self._attr_native_value = int(value)
+            self._update_value(self, value)
             self._is_unavailable = False
+            # Skip the state write on steady readings
+            if not was_unavailable and previous_state == (
+                self._attr_native_value, self._attr_native_unit_of_measurement, self._attr_device_class
+            ):
+                return
             self.async_write_ha_state()
         except ValueError:
             _LOGGER.error("Invalid value received for %s: %s", self._sensor_type, value)
@@ -937,13 +1176,16 @@ class QingpingDeviceSensor(CoordinatorEntity, SensorEntity):
     @callback
     def update_battery_charging(self, is_charging):
         """Update the battery charging state."""
-        if self._sensor_type == SENSOR_BATTERY:
+        if self._sensor_type == SENSOR_BATTERY and self._battery_charging != is_charging:
             self._battery_charging = is_charging
             self.async_write_ha_state()
 
     @callback
     def set_unavailable(self):
         """Set sensor as unavailable."""
+        if self._is_unavailable:
+            # Disabled PM modules keep reporting 99999, nothing changed
+            return
         self._is_unavailable = True
         self._attr_native_value = None
         self.async_write_ha_state()
@@ -956,98 +1198,110 @@ class QingpingDeviceSensor(CoordinatorEntity, SensorEntity):
                 return "mdi:battery-charging"
             elif self._attr_native_value is not None:
                 battery_level = int(self._attr_native_value)
-                if battery_level <= 10:
-                    return "mdi:battery-10"
-                elif battery_level <= 20:
-                    return "mdi:battery-20"
-                elif battery_level <= 30:
-                    return "mdi:battery-30"
-                elif battery_level <= 40:
-                    return "mdi:battery-40"
-                elif battery_level <= 50:
-                    return "mdi:battery-50"
-                elif battery_level <= 60:
-                    return "mdi:battery-60"
-                elif battery_level <= 70:
-                    return "mdi:battery-70"
-                elif battery_level <= 80:
-                    return "mdi:battery-80"
-                elif battery_level <= 90:
-                    return "mdi:battery-90"
-                else:
-                    return "mdi:battery"
+                return _BATTERY_ICONS[min(max(battery_level - 1, 0) // 10, 9)]
         return super().icon
 
-    async def publish_config(self):
-        """Publish configuration message to MQTT."""
+    @callback
+    def forget_published_config(self):
+        """Forget the last published config, after the device got a config some other way."""
+        self._last_published_payload = None
+
+    async def publish_config(self, connection_checked: bool = False, skip_if_unchanged: bool = False):
+        """Publish configuration message to MQTT.
+
+        Pass connection_checked=True when the caller has just ensured MQTT is connected.
+        Pass skip_if_unchanged=True to skip a payload the online device has just received.
+        """
         update_interval = self.coordinator.data.get(CONF_UPDATE_INTERVAL, 15)
-        topic = f"{MQTT_TOPIC_PREFIX}/{self._mac}/down"
+        topic = self._down_topic
         
         # Check if TLV device
-        model = self._config_entry.data.get(CONF_MODEL, "CGS1")
-        if model in TLV_MODELS:
+        if self._is_tlv:
             # Use TLV binary format (CMD 0x32)
             # TLV devices use report mode instead of numeric interval
             report_mode = self._config_entry.data.get(CONF_REPORT_MODE, REPORT_MODE_HISTORIC)
             
-            packets = {}
-            
             if report_mode == REPORT_MODE_REALTIME:
                 # Real-time mode: Enable real-time for 6 hours
-                packets[0x42] = int_to_bytes_little_endian(21600, 2)
-                _LOGGER.info(f"[{self._mac}] TLV config: REAL-TIME mode (fast updates, drains battery)")
+                payload = _TLV_PAYLOAD_REALTIME
+                _LOGGER.info("[%s] TLV config: REAL-TIME mode (fast updates, drains battery)", self._mac)
             else:
                 # Historic mode: Disable real-time
-                packets[0x42] = int_to_bytes_little_endian(0, 2)
-                _LOGGER.info(f"[{self._mac}] TLV config: HISTORIC mode (slow updates, saves battery)")
-            
-            payload = tlv_encode(0x32, packets)
+                payload = _TLV_PAYLOAD_HISTORIC
+                _LOGGER.info("[%s] TLV config: HISTORIC mode (slow updates, saves battery)", self._mac)
         else:
             # Use JSON format for old devices (CGS1, CGS2, CGDN1)
-            payload = json.dumps({
-                ATTR_TYPE: DEFAULT_TYPE,
-                ATTR_UP_ITVL: f"{int(update_interval)}",
-                ATTR_DURATION: DEFAULT_DURATION
-            })
+            payload = _json_config_payload(int(update_interval))
+
+        # Skip a publish the online device has just received
+        status_sensor = self._status_sensor
+        if (
+            skip_if_unchanged
+            and payload == self._last_published_payload
+            and time.monotonic() - self._last_published_ts < MAX_REPUBLISH_AGE
+            and status_sensor is not None
+            and status_sensor.native_value == STATUS_ONLINE
+        ):
+            _LOGGER.debug("[%s] Config unchanged and recently published, skipping", self._mac)
+            return
+
+        if not connection_checked and not await ensure_mqtt_connected(self.hass):
+            _LOGGER.error("MQTT is not connected")
+            return
 
         for attempt in range(MQTT_PUBLISH_RETRY_LIMIT):
-            if not await ensure_mqtt_connected(self.hass):
+            if attempt and not await ensure_mqtt_connected(self.hass):
+                # Only re-check after a failed attempt, the broker may have gone away
                 _LOGGER.error("MQTT is not connected")
                 return
             try:
                 await mqtt.async_publish(self.hass, topic, payload)
-                _LOGGER.info(f"Published config to {topic}")
+                _LOGGER.info("Published config to %s", topic)
+                self._last_published_payload = payload
+                self._last_published_ts = time.monotonic()
                 return
             except HomeAssistantError as err:
-                _LOGGER.warning(f"Failed to publish config (attempt {attempt + 1}): {err}")
+                _LOGGER.warning("Failed to publish config (attempt %s): %s", attempt + 1, err)
                 if attempt < MQTT_PUBLISH_RETRY_LIMIT - 1:
-                    await asyncio.sleep(MQTT_PUBLISH_RETRY_DELAY)
+                    # Exponential backoff with jitter so devices don't retry in lockstep
+                    delay = MQTT_PUBLISH_RETRY_DELAY * (2 ** attempt) + random.uniform(0, MQTT_PUBLISH_RETRY_JITTER)
+                    await asyncio.sleep(min(delay, MQTT_PUBLISH_RETRY_MAX_DELAY))
                 else:
-                    _LOGGER.error(f"Failed to publish config after {MQTT_PUBLISH_RETRY_LIMIT} attempts")
+                    _LOGGER.error("Failed to publish config after %s attempts", MQTT_PUBLISH_RETRY_LIMIT)
 
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        if not self.hass:
+        status_sensor = self._status_sensor
+        if status_sensor is None or status_sensor.native_value != STATUS_ONLINE:
             return False
-        sensors = self.hass.data.get(DOMAIN, {}).get(self._config_entry.entry_id, {}).get("sensors", [])
-        status_sensor = next((sensor for sensor in sensors if isinstance(sensor, QingpingDeviceStatusSensor)), None)
-        is_online = status_sensor.native_value == "online" if status_sensor else False
         
         # For PM sensors, also check if they are disabled
-        if self._sensor_type in [SENSOR_PM10, SENSOR_PM25]:
-            return is_online and not self._is_unavailable
+        if self._is_pm_sensor:
+            return not self._is_unavailable
         
-        return is_online
+        return True
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added to hass."""
         await super().async_added_to_hass()
+        # Re-evaluate availability whenever the device status flips
+        self.async_on_remove(async_dispatcher_connect(
+            self.hass, SIGNAL_AVAILABILITY.format(self._mac), self._async_device_status_changed
+        ))
+
+    @callback
+    def _async_device_status_changed(self) -> None:
+        """Write state when the device status flips, if availability follows it."""
+        # A disabled PM sensor stays unavailable whatever the device status,
+        # and set_unavailable already wrote that state
+        if self._is_pm_sensor and self._is_unavailable:
+            return
+        self.async_write_ha_state()
 
     async def async_will_remove_from_hass(self) -> None:
         """Clean up the timer when entity is removed."""
-        if self.hass and self._config_entry.entry_id in self.hass.data.get(DOMAIN, {}):
-            remove_timer = self.hass.data[DOMAIN][self._config_entry.entry_id].get("remove_timer")
-            if remove_timer:
-                remove_timer()
+        if self._remove_timer:
+            self._remove_timer()
+            self._remove_timer = None
         await super().async_will_remove_from_hass()
\ No newline at end of file
@@ -9,10 +9,73 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import EntityCategory
+from homeassistant.helpers.event import async_call_later
 
 from .const import DOMAIN, CONF_CO2_ASC, TLV_MODELS, CONF_LED_INDICATOR
 from .tlv_encoder import tlv_encode
 
+# TLV config (CMD 0x32) payloads by (KEY, on), KEY 0x40 = CO2 ASC, KEY 0x63 = LED indicator
+_TLV_SWITCH_PAYLOADS = {
+    (tlv_key, on): tlv_encode(0x32, {tlv_key: bytes([1 if on else 0])})
+    for tlv_key in (0x40, 0x63)
+    for on in (True, False)
+}
+
+ENTRY_UPDATE_DELAY = 1  # seconds, coalesces rapid toggles into one config entry write
+
+
+@callback
+def _async_write_switch_state(switch) -> None:
+    """Write the switch state, remembering what was written."""
+    switch._written_state = (switch.is_on, switch.available)
+    switch.async_write_ha_state()
+
+
+@callback
+def _async_schedule_entry_update(switch, key: str) -> None:
+    """Persist the switch's current value for key to its config entry after a delay."""
+    if switch._cancel_entry_update is not None:
+        switch._cancel_entry_update()
+
+    @callback
+    def _write(_now) -> None:
+        switch._cancel_entry_update = None
+        switch.hass.config_entries.async_update_entry(
+            switch._config_entry,
+            data={**switch._config_entry.data, key: switch.coordinator.data[key]},
+        )
+
+    switch._cancel_entry_update = async_call_later(switch.hass, ENTRY_UPDATE_DELAY, _write)
+    # Remember how to write it now, should the switch be removed before the delay
+    switch._flush_entry_update = _write
+
+
+@callback
+def _async_flush_entry_update(switch) -> None:
+    """Write a still pending config entry update immediately."""
+    if switch._cancel_entry_update is not None:
+        switch._cancel_entry_update()
+        switch._flush_entry_update(None)
+
+
+async def _async_set_tlv_switch(switch, key: str, tlv_key: int, on: bool) -> None:
+    """Set a TLV switch value and send the matching TLV command to the device."""
+    if switch.coordinator.data.get(key) == on:
+        # Already in the requested state, nothing to persist or send
+        await switch.coordinator.async_request_refresh()
+        return
+    switch.coordinator.data[key] = on
+    _async_write_switch_state(switch)
+
+    # Persist to the config entry once toggling settles
+    _async_schedule_entry_update(switch, key)
+
+    await switch.coordinator.async_request_refresh()
+
+    # Send TLV command to device (1 = on, 0 = off)
+    topic = switch.coordinator.data["down_topic"]
+    await mqtt.async_publish(switch.hass, topic, _TLV_SWITCH_PAYLOADS[tlv_key, on])
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -63,6 +126,9 @@ class QingpingTLVCO2ASCSwitch(CoordinatorEntity, SwitchEntity):
         super().__init__(coordinator)
         self._config_entry = config_entry
         self._mac = mac
+        self._cancel_entry_update = None
+        self._flush_entry_update = None
+        self._written_state = None
         self._attr_name = f"{name} CO2 Auto Calibration"
         self._attr_unique_id = f"{mac}_co2_asc"
         self._attr_device_info = device_info
@@ -76,51 +142,16 @@ class QingpingTLVCO2ASCSwitch(CoordinatorEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn the switch on."""
-        self.coordinator.data[CONF_CO2_ASC] = True
-        self.async_write_ha_state()
-
-        # Update config entry
-        new_data = dict(self._config_entry.data)
-        new_data[CONF_CO2_ASC] = True
-        self.hass.config_entries.async_update_entry(self._config_entry, data=new_data)
-
-        await self.coordinator.async_request_refresh()
-
-        # Send TLV command to device (KEY 0x40)
-        # 1 = Enable ASC
-        packets = {
-            0x40: bytes([1])
-        }
-        payload = tlv_encode(0x32, packets)
-
-        topic = f"qingping/{self._mac}/down"
-        await mqtt.async_publish(self.hass, topic, payload)
+        await _async_set_tlv_switch(self, CONF_CO2_ASC, 0x40, True)
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn the switch off."""
-        self.coordinator.data[CONF_CO2_ASC] = False
-        self.async_write_ha_state()
-
-        # Update config entry
-        new_data = dict(self._config_entry.data)
-        new_data[CONF_CO2_ASC] = False
-        self.hass.config_entries.async_update_entry(self._config_entry, data=new_data)
-
-        await self.coordinator.async_request_refresh()
-
-        # Send TLV command to device (KEY 0x40)
-        # 0 = Disable ASC
-        packets = {
-            0x40: bytes([0])
-        }
-        payload = tlv_encode(0x32, packets)
-
-        topic = f"qingping/{self._mac}/down"
-        await mqtt.async_publish(self.hass, topic, payload)
+        await _async_set_tlv_switch(self, CONF_CO2_ASC, 0x40, False)
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added to hass."""
         await super().async_added_to_hass()
+        self.async_on_remove(lambda: _async_flush_entry_update(self))
         self._handle_coordinator_update()
 
     @callback
@@ -128,7 +159,9 @@ class QingpingTLVCO2ASCSwitch(CoordinatorEntity, SwitchEntity):
         """Handle updated data from the coordinator."""
         if CONF_CO2_ASC not in self.coordinator.data:
             self.coordinator.data[CONF_CO2_ASC] = self._config_entry.data.get(CONF_CO2_ASC, False)
-        self.async_write_ha_state()
+        # Only write when the switch state actually changed
+        if (self.is_on, self.available) != self._written_state:
+            _async_write_switch_state(self)
 
 class QingpingTLVLEDSwitch(CoordinatorEntity, SwitchEntity):
     """Representation of a Qingping "CGR1W", "CGR1PW" LED Indicator switch."""
@@ -138,6 +171,9 @@ class QingpingTLVLEDSwitch(CoordinatorEntity, SwitchEntity):
         super().__init__(coordinator)
         self._config_entry = config_entry
         self._mac = mac
+        self._cancel_entry_update = None
+        self._flush_entry_update = None
+        self._written_state = None
         self._attr_name = f"{name} LED Indicator"
         self._attr_unique_id = f"{mac}_led_indicator"
         self._attr_device_info = device_info
@@ -151,51 +187,16 @@ class QingpingTLVLEDSwitch(CoordinatorEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn the switch on."""
-        self.coordinator.data[CONF_LED_INDICATOR] = True
-        self.async_write_ha_state()
-
-        # Update config entry
-        new_data = dict(self._config_entry.data)
-        new_data[CONF_LED_INDICATOR] = True
-        self.hass.config_entries.async_update_entry(self._config_entry, data=new_data)
-
-        await self.coordinator.async_request_refresh()
-
-        # Send TLV command to device (KEY 0x63)
-        # 1 = LED On
-        packets = {
-            0x63: bytes([1])
-        }
-        payload = tlv_encode(0x32, packets)
-
-        topic = f"qingping/{self._mac}/down"
-        await mqtt.async_publish(self.hass, topic, payload)
+        await _async_set_tlv_switch(self, CONF_LED_INDICATOR, 0x63, True)
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn the switch off."""
-        self.coordinator.data[CONF_LED_INDICATOR] = False
-        self.async_write_ha_state()
-
-        # Update config entry
-        new_data = dict(self._config_entry.data)
-        new_data[CONF_LED_INDICATOR] = False
-        self.hass.config_entries.async_update_entry(self._config_entry, data=new_data)
-
-        await self.coordinator.async_request_refresh()
-
-        # Send TLV command to device (KEY 0x63)
-        # 0 = LED Off
-        packets = {
-            0x63: bytes([0])
-        }
-        payload = tlv_encode(0x32, packets)
-
-        topic = f"qingping/{self._mac}/down"
-        await mqtt.async_publish(self.hass, topic, payload)
+        await _async_set_tlv_switch(self, CONF_LED_INDICATOR, 0x63, False)
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added to hass."""
         await super().async_added_to_hass()
+        self.async_on_remove(lambda: _async_flush_entry_update(self))
         self._handle_coordinator_update()
 
     @callback
@@ -203,7 +204,9 @@ class QingpingTLVLEDSwitch(CoordinatorEntity, SwitchEntity):
         """Handle updated data from the coordinator."""
         if CONF_LED_INDICATOR not in self.coordinator.data:
             self.coordinator.data[CONF_LED_INDICATOR] = self._config_entry.data.get(CONF_LED_INDICATOR, True)
-        self.async_write_ha_state()
+        # Only write when the switch state actually changed
+        if (self.is_on, self.available) != self._written_state:
+            _async_write_switch_state(self)
 
 class QingpingDeviceCO2ASCSwitch(CoordinatorEntity, SwitchEntity):
     """Switch to enable/disable CO2 Automatic Self-Calibration."""
@@ -213,6 +216,9 @@ class QingpingDeviceCO2ASCSwitch(CoordinatorEntity, SwitchEntity):
         super().__init__(coordinator)
         self._config_entry = config_entry
         self._mac = mac
+        self._cancel_entry_update = None
+        self._flush_entry_update = None
+        self._written_state = None
         self._attr_name = f"{name} CO2 Auto Calibration"
         self._attr_unique_id = f"{mac}_co2_asc"
         self._attr_device_info = device_info
@@ -234,23 +240,26 @@ class QingpingDeviceCO2ASCSwitch(CoordinatorEntity, SwitchEntity):
 
     async def _set_value(self, value: int) -> None:
         """Set the CO2 ASC value."""
+        if self.coordinator.data.get(CONF_CO2_ASC) == value:
+            # Already in the requested state, nothing to persist or send
+            await self.coordinator.async_request_refresh()
+            return
         self.coordinator.data[CONF_CO2_ASC] = value
-        self.async_write_ha_state()
+        _async_write_switch_state(self)
 
-        # Update config entry
-        new_data = dict(self._config_entry.data)
-        new_data[CONF_CO2_ASC] = value
-        self.hass.config_entries.async_update_entry(self._config_entry, data=new_data)
+        # Persist to the config entry once toggling settles
+        _async_schedule_entry_update(self, CONF_CO2_ASC)
 
         await self.coordinator.async_request_refresh()
 
         # Publish setting change to device
         from .sensor import publish_setting_change
-        await publish_setting_change(self.hass, self._mac, CONF_CO2_ASC, value)
+        await publish_setting_change(self.hass, self._config_entry, CONF_CO2_ASC, value)
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added to hass."""
         await super().async_added_to_hass()
+        self.async_on_remove(lambda: _async_flush_entry_update(self))
         self._handle_coordinator_update()
 
     @callback
@@ -258,4 +267,6 @@ class QingpingDeviceCO2ASCSwitch(CoordinatorEntity, SwitchEntity):
         """Handle updated data from the coordinator."""
         if CONF_CO2_ASC not in self.coordinator.data:
             self.coordinator.data[CONF_CO2_ASC] = self._config_entry.data.get(CONF_CO2_ASC, 1)
-        self.async_write_ha_state()
\ No newline at end of file
+        # Only write when the switch state actually changed
+        if (self.is_on, self.available) != self._written_state:
+            _async_write_switch_state(self)
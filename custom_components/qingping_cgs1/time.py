@@ -13,6 +13,7 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import EntityCategory
 
 from .const import DOMAIN, CONF_NIGHT_MODE_START_TIME, CONF_NIGHT_MODE_END_TIME
+from .sensor import publish_setting_change
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -50,6 +51,12 @@ async def async_setup_entry(
 class QingpingDeviceTimeEntity(CoordinatorEntity, TimeEntity):
     """Representation of a Qingping Device time entity."""
 
+    # HA entity bases keep a __dict__; these slots only cover the
+    # per-entity attributes set in __init__
+    __slots__ = (
+        "_config_entry", "_mac", "_time_key", "_default_minutes", "_cached_minutes", "_cached_time",
+    )
+
     def __init__(self, coordinator, config_entry, mac, name, time_name, time_key, device_info, default_minutes):
         """Initialize the time entity."""
         super().__init__(coordinator)
@@ -61,14 +68,20 @@ class QingpingDeviceTimeEntity(CoordinatorEntity, TimeEntity):
         self._attr_unique_id = f"{mac}_{time_key}"
         self._attr_device_info = device_info
         self._attr_entity_category = EntityCategory.CONFIG
+        # Last minutes value and the datetime.time built from it
+        self._cached_minutes = -1
+        self._cached_time = None
         
     @property
     def native_value(self) -> datetime.time | None:
         """Return the current time value."""
         minutes = self.coordinator.data.get(self._time_key, self._default_minutes)
-        hours = minutes // 60
-        mins = minutes % 60
-        return datetime.time(hour=hours, minute=mins)
+        if minutes == self._cached_minutes:
+            return self._cached_time
+        hours, mins = divmod(minutes, 60)
+        self._cached_time = datetime.time(hour=hours, minute=mins)
+        self._cached_minutes = minutes
+        return self._cached_time
 
     async def async_set_value(self, value: datetime.time) -> None:
         """Update the current time value."""
@@ -86,8 +99,7 @@ class QingpingDeviceTimeEntity(CoordinatorEntity, TimeEntity):
         await self.coordinator.async_request_refresh()
         
         # Publish setting change to device
-        from .sensor import publish_setting_change
-        await publish_setting_change(self.hass, self._mac, self._time_key, minutes)
+        await publish_setting_change(self.hass, self._config_entry, self._time_key, minutes)
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added to hass."""
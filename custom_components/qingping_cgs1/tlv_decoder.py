@@ -2,40 +2,101 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
+import struct
+from datetime import datetime, timedelta
+from time import localtime, strftime
 from typing import Any
 
 _LOGGER = logging.getLogger(__name__)
 
+# Message header: "CG" marker (checked by tlv_decode), command, payload length
+_HEADER = struct.Struct("<2xBH")
+# Sub-packet header: key, length
+_SUB_HEADER = struct.Struct("<BH")
+# TH record: low byte and high word of the 24-bit temperature/humidity value,
+# pressure, battery
+_TH = struct.Struct("<BHHB")
+# Real-time record: timestamp, TH record, signed RSSI
+_RT = struct.Struct("<IBHHBb")
+# History header: timestamp of the first record, seconds between records
+_HISTORY_HEADER = struct.Struct("<IH")
+
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Sensor data v2 header: timestamp, sensor type
+_SENSOR_V2_HEADER = struct.Struct("<IB")
+# Sensor data v2 fields as (name, divisor), None keeping the raw integer
+_V2_TEMPERATURE = ("temperature", 10.0)
+_V2_HUMIDITY = ("humidity", 10.0)
+_V2_PRESSURE = ("pressure", 100.0)
+_V2_CO2 = ("co2", None)
+# Sensor data v2 layouts by sensor type: values following the header, their fields
+_SENSOR_V2_LAYOUTS = {
+    1: (struct.Struct("<HH"), (_V2_TEMPERATURE, _V2_HUMIDITY)),  # Temperature + Humidity
+    2: (struct.Struct("<H"), (_V2_TEMPERATURE,)),  # Temperature only
+    3: (struct.Struct("<HHH"), (_V2_TEMPERATURE, _V2_HUMIDITY, _V2_PRESSURE)),  # Temperature + Humidity + Pressure
+    4: (struct.Struct("<HHH"), (_V2_TEMPERATURE, _V2_HUMIDITY, _V2_CO2)),  # Temperature + Humidity + CO2
+    # Full environment monitor ("CGR1W", "CGR1PW")
+    10: (struct.Struct("<HHHHHHHI"), (
+        _V2_TEMPERATURE, _V2_HUMIDITY, _V2_CO2, ("pm25", None), ("pm10", None),
+        ("tvoc", None), ("noise", None), ("light", None),
+    )),
+}
+
 
 def bytes_to_int_little_endian(byte_array: bytes) -> int:
     """Convert little endian bytes to integer."""
-    val = 0
-    for i in range(len(byte_array)):
-        val = val | byte_array[i] << i * 8
-    return val
+    return int.from_bytes(byte_array, "little")
+
+
+def _le_int(byte_array: bytes) -> int:
+    """Convert short little endian bytes to integer, inlining 1 and 2 byte values."""
+    size = len(byte_array)
+    if size == 1:
+        return byte_array[0]
+    if size == 2:
+        return byte_array[0] | byte_array[1] << 8
+    return int.from_bytes(byte_array, "little")
 
 
 def fmt_timestamp(timestamp: int) -> str:
     """Format timestamp to human readable string."""
-    dt = datetime.fromtimestamp(timestamp)
-    return dt.strftime("%Y-%m-%d %H:%M:%S")
+    return strftime(_TIME_FORMAT, localtime(timestamp))
+
+
+def _fmt_timestamp_series(timestamp: int, step: int, count: int) -> list[str]:
+    """Format count timestamps spaced step seconds apart, starting at timestamp."""
+    if count <= 0:
+        return []
+    current = datetime.fromtimestamp(timestamp)
+    delta = timedelta(seconds=step)
+    last = timestamp + step * (count - 1)
+    if datetime.fromtimestamp(last) != current + delta * (count - 1):
+        # The series crosses a UTC offset change (DST), convert every timestamp
+        return [fmt_timestamp(timestamp + step * i) for i in range(count)]
+    # Whole-second datetimes render as _TIME_FORMAT through isoformat
+    times = []
+    for _ in range(count):
+        times.append(current.isoformat(" "))
+        current += delta
+    return times
 
 
 def tlv_unpack(byte_array: bytes) -> dict[str, Any]:
     """Unpack TLV data starting with 4347 (CG)."""
-    if len(byte_array) < 5:
+    header_size = _HEADER.size
+    if len(byte_array) < header_size:
         _LOGGER.error("Byte array too short for TLV unpacking")
         return {"cmd": None, "productId": 0, "length": 0, "subPackList": []}
     
-    cmd = byte_array[2:3].hex()
-    length = bytes_to_int_little_endian(byte_array[3:5])
+    cmd, length = _HEADER.unpack_from(byte_array, 0)
     
-    if len(byte_array) < 5 + length:
+    if len(byte_array) < header_size + length:
         _LOGGER.error("Byte array shorter than expected length")
         return {"cmd": cmd, "productId": 0, "length": length, "subPackList": []}
     
-    payload = byte_array[5:5 + length]
+    # Sub-packet payloads are memoryview slices of the message, not copies
+    payload = memoryview(byte_array)[header_size:header_size + length]
     product_id = 0
 
     index = 0
@@ -46,8 +107,7 @@ def tlv_unpack(byte_array: bytes) -> dict[str, Any]:
             _LOGGER.warning("Truncated TLV data at index %d", index)
             break
             
-        key = payload[index:index + 1].hex()
-        sub_len = bytes_to_int_little_endian(payload[index + 1:index + 3])
+        key, sub_len = _SUB_HEADER.unpack_from(payload, index)
         
         if index + 3 + sub_len > length:
             _LOGGER.warning("Sub-packet extends beyond payload at index %d", index)
@@ -62,7 +122,7 @@ def tlv_unpack(byte_array: bytes) -> dict[str, Any]:
             "payload": sub_payload,
         }
 
-        if key == "38":
+        if key == 0x38:
             product_id = sub_payload[0] if len(sub_payload) > 0 else 0
 
         sub_pack_list.append(sub_pack)
@@ -77,15 +137,15 @@ def tlv_unpack(byte_array: bytes) -> dict[str, Any]:
 
 def decode_th_data(byte_array: bytes) -> dict[str, Any]:
     """Decode temperature, humidity, pressure, and battery data."""
-    if len(byte_array) < 6:
+    if len(byte_array) < _TH.size:
         _LOGGER.error("Byte array too short for TH data decoding")
         return {}
     
-    th = bytes_to_int_little_endian(byte_array[0:3])
+    th_lo, th_hi, pressure_raw, battery = _TH.unpack_from(byte_array, 0)
+    th = th_lo | th_hi << 8
     temperature = ((th >> 12) - 500) / 10
     humidity = (th & 0xFFF) / 10
-    pressure = bytes_to_int_little_endian(byte_array[3:5]) / 100.0  # Convert to kPa
-    battery = byte_array[5]
+    pressure = pressure_raw / 100.0  # Convert to kPa
 
     return {
         "dataType": "data",
@@ -100,217 +160,174 @@ def decode_th_data(byte_array: bytes) -> dict[str, Any]:
 
 def decode_realtime_data(byte_array: bytes, product_id: int = 0) -> dict[str, Any]:
     """Decode real-time sensor data."""
-    if len(byte_array) < 11:
+    if len(byte_array) < _RT.size:
         _LOGGER.error("Byte array too short for realtime data decoding")
         return {}
     
-    timestamp = bytes_to_int_little_endian(byte_array[0:4])
-    realtime_data = decode_th_data(byte_array[4:])
-    rssi = byte_array[10]
-    if rssi >= 128:
-        rssi = rssi - 256
-
-    realtime_data["dataType"] = "event"
-    realtime_data["timestamp"] = timestamp
-    realtime_data["time"] = fmt_timestamp(timestamp)
-    realtime_data["rssi"] = rssi
-    
-    return realtime_data
+    timestamp, th_lo, th_hi, pressure_raw, battery, rssi = _RT.unpack_from(byte_array, 0)
+    th = th_lo | th_hi << 8
+
+    return {
+        "dataType": "event",
+        "timestamp": timestamp,
+        "time": fmt_timestamp(timestamp),
+        "temperature": ((th >> 12) - 500) / 10,
+        "humidity": (th & 0xFFF) / 10,
+        "pressure": pressure_raw / 100.0,  # Convert to kPa
+        "battery": battery,
+        "rssi": rssi,
+    }
 
 
 def decode_history_data(byte_array: bytes, product_id: int = 0) -> list[dict[str, Any]]:
     """Decode historical sensor data."""
-    if len(byte_array) < 6:
+    header_size = _HISTORY_HEADER.size
+    if len(byte_array) < header_size:
         _LOGGER.error("Byte array too short for history data decoding")
         return []
     
-    timestamp = bytes_to_int_little_endian(byte_array[0:4])
-    duration = bytes_to_int_little_endian(byte_array[4:6])
+    timestamp, duration = _HISTORY_HEADER.unpack_from(byte_array, 0)
 
-    history_data_list = []
-    pack_len = 6
-    index = 6
-    i = 0
-    
-    while index + pack_len <= len(byte_array):
-        history_pack = byte_array[index:index + pack_len]
-        history_data = decode_th_data(history_pack)
-        history_data["timestamp"] = timestamp + duration * i
-        history_data["dataType"] = "data"
-        history_data["time"] = fmt_timestamp(history_data["timestamp"])
+    # Decode all complete TH records in one pass, ignoring a trailing partial one
+    count = (len(byte_array) - header_size) // _TH.size
+    records = _TH.iter_unpack(memoryview(byte_array)[header_size:header_size + count * _TH.size])
+    times = _fmt_timestamp_series(timestamp, duration, count)
 
-        history_data_list.append(history_data)
-        i += 1
-        index += pack_len
+    history_data_list = []
+    for i, (th_lo, th_hi, pressure_raw, battery) in enumerate(records):
+        th = th_lo | th_hi << 8
+        history_data_list.append({
+            "dataType": "data",
+            "timestamp": timestamp + duration * i,
+            "time": times[i],
+            "temperature": ((th >> 12) - 500) / 10,
+            "humidity": (th & 0xFFF) / 10,
+            "pressure": pressure_raw / 100.0,  # Convert to kPa
+            "battery": battery,
+        })
 
     return history_data_list
 
 
 def decode_sensor_data_v2(byte_array: bytes) -> dict[str, Any]:
     """Decode sensor data version 2 (TLV key 0x85)."""
-    if len(byte_array) < 5:
+    header_size = _SENSOR_V2_HEADER.size
+    if len(byte_array) < header_size:
         _LOGGER.error("Byte array too short for sensor data v2 decoding")
         return {}
     
-    sensor_data = {}
-    timestamp = bytes_to_int_little_endian(byte_array[0:4])
-    sensor_data["timestamp"] = timestamp
-
-    sensor_type = byte_array[4]
-    
-    if sensor_type == 1:  # Temperature + Humidity
-        if len(byte_array) >= 9:
-            temperature_val = bytes_to_int_little_endian(byte_array[5:7])
-            humidity_val = bytes_to_int_little_endian(byte_array[7:9])
-            sensor_data["temperature"] = temperature_val / 10.0
-            sensor_data["humidity"] = humidity_val / 10.0
-            
-    elif sensor_type == 2:  # Temperature only
-        if len(byte_array) >= 7:
-            temperature_val = bytes_to_int_little_endian(byte_array[5:7])
-            sensor_data["temperature"] = temperature_val / 10.0
-            
-    elif sensor_type == 3:  # Temperature + Humidity + Pressure
-        if len(byte_array) >= 11:
-            temperature_val = bytes_to_int_little_endian(byte_array[5:7])
-            humidity_val = bytes_to_int_little_endian(byte_array[7:9])
-            pressure_val = bytes_to_int_little_endian(byte_array[9:11])
-            sensor_data["temperature"] = temperature_val / 10.0
-            sensor_data["humidity"] = humidity_val / 10.0
-            sensor_data["pressure"] = pressure_val / 100.0
-            
-    elif sensor_type == 4:  # Temperature + Humidity + CO2
-        if len(byte_array) >= 11:
-            temperature_val = bytes_to_int_little_endian(byte_array[5:7])
-            humidity_val = bytes_to_int_little_endian(byte_array[7:9])
-            co2_val = bytes_to_int_little_endian(byte_array[9:11])
-            sensor_data["temperature"] = temperature_val / 10.0
-            sensor_data["humidity"] = humidity_val / 10.0
-            sensor_data["co2"] = co2_val
-            
-    elif sensor_type == 10:  # Full environment monitor ("CGR1W", "CGR1PW")
-        if len(byte_array) >= 23:
-            temperature_val = bytes_to_int_little_endian(byte_array[5:7])
-            humidity_val = bytes_to_int_little_endian(byte_array[7:9])
-            co2_val = bytes_to_int_little_endian(byte_array[9:11])
-            pm25_val = bytes_to_int_little_endian(byte_array[11:13])
-            pm10_val = bytes_to_int_little_endian(byte_array[13:15])
-            tvoc_val = bytes_to_int_little_endian(byte_array[15:17])
-            noise_val = bytes_to_int_little_endian(byte_array[17:19])
-            light_val = bytes_to_int_little_endian(byte_array[19:23])
-            
-            sensor_data["temperature"] = temperature_val / 10.0
-            sensor_data["humidity"] = humidity_val / 10.0
-            sensor_data["co2"] = co2_val
-            sensor_data["pm25"] = pm25_val
-            sensor_data["pm10"] = pm10_val
-            sensor_data["tvoc"] = tvoc_val
-            sensor_data["noise"] = noise_val
-            sensor_data["light"] = light_val
+    timestamp, sensor_type = _SENSOR_V2_HEADER.unpack_from(byte_array, 0)
+    sensor_data = {"timestamp": timestamp}
+
+    layout = _SENSOR_V2_LAYOUTS.get(sensor_type)
+    if layout is not None:
+        values, fields = layout
+        if len(byte_array) >= header_size + values.size:
+            for (field, divisor), value in zip(fields, values.unpack_from(byte_array, header_size)):
+                sensor_data[field] = value / divisor if divisor else value
             
     return sensor_data
 
 
+def _decode_realtime(payload: bytes, out_data: dict[str, Any], data_list: list) -> None:
+    """Real-time data (key 0x14)."""
+    realtime_data = decode_realtime_data(payload, out_data["productId"])
+    if realtime_data:
+        out_data["sensorData"] = [realtime_data]
+
+
+def _decode_history(payload: bytes, out_data: dict[str, Any], data_list: list) -> None:
+    """History data (key 0x03)."""
+    history_data = decode_history_data(payload, out_data["productId"])
+    if history_data:
+        out_data["sensorData"] = history_data
+
+
+def _string_decoder(field: str, name: str):
+    """Return a handler storing a UTF-8 string sub-packet in field."""
+    def _decode(payload: bytes, out_data: dict[str, Any], data_list: list) -> None:
+        try:
+            out_data[field] = str(payload, "utf-8")
+        except UnicodeDecodeError:
+            _LOGGER.warning("Failed to decode %s string", name)
+    return _decode
+
+
+def _int_decoder(field: str):
+    """Return a handler storing a little endian integer sub-packet in field."""
+    def _decode(payload: bytes, out_data: dict[str, Any], data_list: list) -> None:
+        if len(payload) >= 1:
+            out_data[field] = _le_int(payload)
+    return _decode
+
+
+def _byte_decoder(field: str):
+    """Return a handler storing the first byte of a sub-packet in field."""
+    def _decode(payload: bytes, out_data: dict[str, Any], data_list: list) -> None:
+        if len(payload) >= 1:
+            out_data[field] = payload[0]
+    return _decode
+
+
+def _decode_sensor_v2(payload: bytes, out_data: dict[str, Any], data_list: list) -> None:
+    """Sensor data v2 (key 0x85)."""
+    sensor_data = decode_sensor_data_v2(payload)
+    if sensor_data:
+        data_list.append(sensor_data)
+
+
+def _decode_usb_plugged_in(payload: bytes, out_data: dict[str, Any], data_list: list) -> None:
+    """USB plug-in status / Charging status (key 0x2c)."""
+    if len(payload) >= 1:
+        out_data["usbPluggedIn"] = payload[0] == 1
+        out_data["batteryCharging"] = payload[0] == 1
+
+
+def _decode_pm_module(payload: bytes, out_data: dict[str, Any], data_list: list) -> None:
+    """PM module serial number (key 0x61)."""
+    if len(payload) == 0:
+        out_data["pmModuleConnected"] = False
+    else:
+        out_data["pmModuleConnected"] = True
+        out_data["pmModuleSerial"] = payload.hex()
+
+
+# Sub-packet handlers by TLV key, each updating out_data or appending to data_list
+_SUB_PACK_HANDLERS = {
+    0x14: _decode_realtime,
+    0x03: _decode_history,
+    0x11: _string_decoder("version", "version"),  # Firmware version
+    0x34: _string_decoder("versionModel", "version model"),
+    0x35: _string_decoder("versionMcu", "version MCU"),
+    0x04: _int_decoder("reportInterval"),
+    0x05: _int_decoder("collectInterval"),
+    0x85: _decode_sensor_v2,
+    0x1D: _byte_decoder("deviceStatus"),  # Device running status
+    0x64: _byte_decoder("battery"),  # Battery percentage
+    0x09: _byte_decoder("battery"),  # Battery info - old devices
+    0x65: _int_decoder("signalStrength"),
+    0x2C: _decode_usb_plugged_in,
+    0x61: _decode_pm_module,
+}
+
+
 def tlv_decode(byte_array: bytes) -> dict[str, Any]:
     """Main TLV decoder function."""
     try:
         # Check if data starts with "CG" (0x43 0x47)
-        if len(byte_array) < 2 or byte_array[0:2] != b'CG':
+        if len(byte_array) < 2 or byte_array[0] != 0x43 or byte_array[1] != 0x47:
             _LOGGER.error("Invalid TLV data: does not start with 'CG' marker")
             return {}
         
         unpack_data = tlv_unpack(byte_array)
         out_data = {"productId": unpack_data["productId"]}
         data_list = []
+        handlers = _SUB_PACK_HANDLERS
 
         for sub_pack in unpack_data["subPackList"]:
-            key = sub_pack["key"]
-            payload = sub_pack["payload"]
-            
-            # Real-time data (key 0x14)
-            if key == "14":
-                realtime_data = decode_realtime_data(payload, unpack_data["productId"])
-                if realtime_data:
-                    out_data["sensorData"] = [realtime_data]
-            
-            # History data (key 0x03)
-            elif key == "03":
-                history_data = decode_history_data(payload, unpack_data["productId"])
-                if history_data:
-                    out_data["sensorData"] = history_data
-            
-            # Firmware version (key 0x11)
-            elif key == "11":
-                try:
-                    out_data["version"] = payload.decode("utf-8")
-                except UnicodeDecodeError:
-                    _LOGGER.warning("Failed to decode version string")
-            
-            # Version model (key 0x34)
-            elif key == "34":
-                try:
-                    out_data["versionModel"] = payload.decode("utf-8")
-                except UnicodeDecodeError:
-                    _LOGGER.warning("Failed to decode version model string")
-            
-            # Version MCU (key 0x35)
-            elif key == "35":
-                try:
-                    out_data["versionMcu"] = payload.decode("utf-8")
-                except UnicodeDecodeError:
-                    _LOGGER.warning("Failed to decode version MCU string")
-            
-            # Report interval (key 0x04)
-            elif key == "04":
-                if len(payload) >= 1:
-                    report_interval = bytes_to_int_little_endian(payload)
-                    out_data["reportInterval"] = report_interval
-            
-            # Collect interval (key 0x05)
-            elif key == "05":
-                if len(payload) >= 1:
-                    collect_interval = bytes_to_int_little_endian(payload)
-                    out_data["collectInterval"] = collect_interval
-            
-            # Sensor data v2 (key 0x85)
-            elif key == "85":
-                sensor_data = decode_sensor_data_v2(payload)
-                if sensor_data:
-                    data_list.append(sensor_data)
-            
-            # Device running status (key 0x1d)
-            elif key == "1d":
-                if len(payload) >= 1:
-                    out_data["deviceStatus"] = payload[0]
-            
-            # Battery percentage (key 0x64)
-            elif key == "64":
-                if len(payload) >= 1:
-                    out_data["battery"] = payload[0]
-
-            # Battery info (key 0x09) - old devices
-            elif key == "09":
-                if len(payload) >= 1:
-                    out_data["battery"] = payload[0]
-
-            # Signal strength (key 0x65)
-            elif key == "65":
-                if len(payload) >= 1:
-                    out_data["signalStrength"] = bytes_to_int_little_endian(payload)
-
-            # USB plug-in status / Charging status (key 0x2c)
-            elif key == "2c":
-                if len(payload) >= 1:
-                    out_data["usbPluggedIn"] = payload[0] == 1
-                    out_data["batteryCharging"] = payload[0] == 1
-
-            # PM module serial number (key 0x61)
-            elif key == "61":
-                if len(payload) == 0:
-                    out_data["pmModuleConnected"] = False
-                else:
-                    out_data["pmModuleConnected"] = True
-                    out_data["pmModuleSerial"] = payload.hex()
+            handler = handlers.get(sub_pack["key"])
+            if handler is not None:
+                handler(sub_pack["payload"], out_data, data_list)
         # If we collected sensor data v2 records, use thos
         if len(data_list) > 0:
             out_data["sensorData"] = data_list
@@ -325,4 +342,4 @@ def tlv_decode(byte_array: bytes) -> dict[str, Any]:
 def is_tlv_format(payload: bytes) -> bool:
     """Check if the payload is in TLV binary format."""
     # TLV format starts with "CG" (0x43 0x47)
-    return len(payload) >= 2 and payload[0:2] == b'CG'
+    return len(payload) >= 2 and payload[0] == 0x43 and payload[1] == 0x47
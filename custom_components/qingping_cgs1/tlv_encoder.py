@@ -2,10 +2,15 @@
 from __future__ import annotations
 
 import logging
+import struct
 from typing import Any
 
 _LOGGER = logging.getLogger(__name__)
 
+# Fixed 2-byte little endian encoders for TLV lengths and values
+_U16 = struct.Struct('<H')
+_I16 = struct.Struct('<h')
+
 
 def int_to_bytes_little_endian(value: int, length: int, signed: bool = False) -> bytes:
     """Convert integer to little endian bytes."""
@@ -18,10 +23,17 @@ def encode_tlv_packet(key: int, data: bytes) -> bytes:
     return bytes([key]) + int_to_bytes_little_endian(length, 2) + data
 
 
+def _append_tlv(buf: bytearray, key: int, data: bytes) -> None:
+    """Append a single TLV packet (key + length + data) to buf."""
+    buf.append(key)
+    buf += _U16.pack(len(data))
+    buf += data
+
+
 def calculate_checksum(data: bytes) -> bytes:
     """Calculate checksum - sum of all bytes."""
     checksum = sum(data) & 0xFFFF  # Keep only lower 16 bits
-    return int_to_bytes_little_endian(checksum, 2)
+    return checksum.to_bytes(2, 'little')
 
 
 def tlv_encode(command: int, packets: dict[int, bytes]) -> bytes:
@@ -35,22 +47,20 @@ def tlv_encode(command: int, packets: dict[int, bytes]) -> bytes:
     Returns:
         Complete TLV message starting with 'CG'
     """
-    # Build payload from packets
-    payload = b''
+    # Build message in place: CG + command + length placeholder + payload
+    message = bytearray(b'CG')
+    message.append(command)
+    message += b'\x00\x00'
     for key, data in packets.items():
-        payload += encode_tlv_packet(key, data)
+        _append_tlv(message, key, data)
     
-    # Build message: CG + command + length + payload
-    message = b'CG'
-    message += bytes([command])
-    message += int_to_bytes_little_endian(len(payload), 2)
-    message += payload
+    # Fill in the payload length now that the payload is known
+    _U16.pack_into(message, 3, len(message) - 5)
     
     # Add checksum (sum of all bytes so far)
-    checksum = calculate_checksum(message)
-    message += checksum
+    message += calculate_checksum(message)
     
-    return message
+    return bytes(message)
 
 
 # Command builders for common operations
@@ -63,8 +73,8 @@ def build_config_command(update_interval_minutes: int = 15, collect_interval_sec
         collect_interval_seconds: Data recording interval in seconds (key 0x05)
     """
     packets = {
-        0x04: int_to_bytes_little_endian(update_interval_minutes, 2),
-        0x05: int_to_bytes_little_endian(collect_interval_seconds, 2),
+        0x04: _U16.pack(update_interval_minutes),
+        0x05: _U16.pack(collect_interval_seconds),
     }
     return tlv_encode(0x02, packets)
 
@@ -91,21 +101,21 @@ def build_offset_command(
     if temperature_offset != 0.0:
         # Convert to device format: value * 10 (signed)
         temp_val = int(temperature_offset * 10)
-        packets[0x46] = int_to_bytes_little_endian(temp_val, 2, signed=True)
+        packets[0x46] = _I16.pack(temp_val)
     
     if humidity_offset != 0.0:
         # Convert to device format: value * 10 (signed)
         hum_val = int(humidity_offset * 10)
-        packets[0x48] = int_to_bytes_little_endian(hum_val, 2, signed=True)
+        packets[0x48] = _I16.pack(hum_val)
     
     if co2_offset != 0:
-        packets[0x45] = int_to_bytes_little_endian(co2_offset, 2, signed=True)
+        packets[0x45] = _I16.pack(co2_offset)
     
     if pm25_offset != 0:
-        packets[0x4B] = int_to_bytes_little_endian(pm25_offset, 2, signed=True)
+        packets[0x4B] = _I16.pack(pm25_offset)
     
     if pm10_offset != 0:
-        packets[0x4D] = int_to_bytes_little_endian(pm10_offset, 2, signed=True)
+        packets[0x4D] = _I16.pack(pm10_offset)
     
     if not packets:
         _LOGGER.warning("No offsets provided, creating empty command")
@@ -151,36 +161,41 @@ def tlv_to_hex(tlv_data: bytes) -> str:
     return tlv_data.hex()
 
 
-if __name__ == '__main__':
-    # Test encoding
-    print("Testing TLV Encoder")
-    print("="*80)
+def _demo() -> str:
+    """Return sample encoded commands, printed when run as a script."""
+    lines = ["Testing TLV Encoder", "=" * 80]
     
-    print("\n1. Config command (15 min update, 60 sec collect):")
+    lines.append("\n1. Config command (15 min update, 60 sec collect):")
     cmd = build_config_command(15, 60)
-    print(f"   HEX: {tlv_to_hex(cmd)}")
-    print(f"   Length: {len(cmd)} bytes")
+    lines.append(f"   HEX: {tlv_to_hex(cmd)}")
+    lines.append(f"   Length: {len(cmd)} bytes")
     
-    print("\n2. Temperature offset +1.5°C:")
+    lines.append("\n2. Temperature offset +1.5°C:")
     cmd = build_offset_command(temperature_offset=1.5)
-    print(f"   HEX: {tlv_to_hex(cmd)}")
+    lines.append(f"   HEX: {tlv_to_hex(cmd)}")
     
-    print("\n3. Multiple offsets (temp +1.0, humidity -2.5, CO2 +50):")
+    lines.append("\n3. Multiple offsets (temp +1.0, humidity -2.5, CO2 +50):")
     cmd = build_offset_command(temperature_offset=1.0, humidity_offset=-2.5, co2_offset=50)
-    print(f"   HEX: {tlv_to_hex(cmd)}")
+    lines.append(f"   HEX: {tlv_to_hex(cmd)}")
     
-    print("\n4. Enable CO2 ASC:")
+    lines.append("\n4. Enable CO2 ASC:")
     cmd = build_co2_asc_command(True)
-    print(f"   HEX: {tlv_to_hex(cmd)}")
+    lines.append(f"   HEX: {tlv_to_hex(cmd)}")
     
-    print("\n5. Disable CO2 ASC:")
+    lines.append("\n5. Disable CO2 ASC:")
     cmd = build_co2_asc_command(False)
-    print(f"   HEX: {tlv_to_hex(cmd)}")
+    lines.append(f"   HEX: {tlv_to_hex(cmd)}")
     
-    print("\n6. Request settings:")
+    lines.append("\n6. Request settings:")
     cmd = build_request_settings_command()
-    print(f"   HEX: {tlv_to_hex(cmd)}")
+    lines.append(f"   HEX: {tlv_to_hex(cmd)}")
     
-    print("\n7. Enable LED:")
+    lines.append("\n7. Enable LED:")
     cmd = build_led_switch_command(True)
-    print(f"   HEX: {tlv_to_hex(cmd)}")
+    lines.append(f"   HEX: {tlv_to_hex(cmd)}")
+    
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    print(_demo())